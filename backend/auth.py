@@ -1,11 +1,13 @@
 import os
+import time
+import hashlib
 import requests
 from fastapi import Depends, HTTPException, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jws, jwt, ExpiredSignatureError, JWTError, JWSError
 from jose.exceptions import JWTClaimsError
 from pydantic import BaseModel
-from typing import Annotated
+from typing import Annotated, Dict, Optional, Tuple
 from logger_config import setup_logger
 from dotenv import load_dotenv
 
@@ -42,6 +44,12 @@ if AUTH0_DOMAIN:
 
 security = HTTPBearer()
 
+# Verified token cache, keyed by token hash so bursts of requests pay for signature verification once
+TOKEN_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_EXP_MARGIN = 10  # seconds kept between a cache entry's expiry and the token's exp, for clock skew
+TOKEN_CACHE_MAX_ENTRIES = 10000
+_token_cache: Dict[str, Tuple[float, "UserClaims"]] = {}
+
 
 class UserClaims(BaseModel):
     """Pydantic model for expected user claims in the token."""
@@ -67,6 +75,37 @@ def find_public_key(kid: str):
     raise HTTPException(status_code=401, detail=f"Public key not found for kid: {kid}")
 
 
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _get_cached_claims(token: str) -> Optional[UserClaims]:
+    """Return cached claims for an already-verified token, if still fresh."""
+    key = _token_cache_key(token)
+    entry = _token_cache.get(key)
+    if not entry:
+        return None
+    expires_at, claims = entry
+    if expires_at <= time.time():
+        _token_cache.pop(key, None)
+        return None
+    return claims
+
+
+def _cache_claims(token: str, claims: UserClaims, token_exp: Optional[float]) -> None:
+    """Cache verified claims until shortly before the token expires, for at most TOKEN_CACHE_TTL seconds."""
+    now = time.time()
+    ttl = TOKEN_CACHE_TTL if token_exp is None else min(token_exp - now - TOKEN_CACHE_EXP_MARGIN, TOKEN_CACHE_TTL)
+    if ttl <= 0:
+        return
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        for key in [k for k, (expires_at, _) in _token_cache.items() if expires_at <= now]:
+            _token_cache.pop(key, None)
+        if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.clear()
+    _token_cache[_token_cache_key(token)] = (now + ttl, claims)
+
+
 def validate_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
 ) -> UserClaims:
@@ -74,6 +113,10 @@ def validate_token(
         raise HTTPException(status_code=500, detail="Auth0 configuration missing on server.")
 
     token = credentials.credentials
+    cached_claims = _get_cached_claims(token)
+    if cached_claims:
+        return cached_claims
+
     try:
         unverified_headers = jws.get_unverified_header(token)
         public_key = find_public_key(unverified_headers.get("kid"))
@@ -92,11 +135,13 @@ def validate_token(
             logger.error("Token missing required claims (name, email): %s", token_payload)
             raise HTTPException(status_code=401, detail="Token missing required claims.")
 
-        return UserClaims(
+        claims = UserClaims(
             name=token_payload["name"],
             email=token_payload["email"],
             # sub=token_payload.get("sub") # Example: include subject if needed
         )
+        _cache_claims(token, claims, token_payload.get("exp"))
+        return claims
     except ExpiredSignatureError:
         logger.warning("Token validation failed: Expired signature")
         raise HTTPException(status_code=401, detail="Token has expired.")
@@ -116,11 +161,26 @@ def validate_token(
         raise HTTPException(status_code=500, detail="An unexpected error occurred during authentication.")
 
 
+def normalize_user_id(email: str) -> str:
+    """Derive the user ID (the key of the user's Cosmos document) from the token email claim."""
+    # Emails are used as stored, only stripped; lowercasing would orphan existing mixed-case user documents
+    return email.strip()
+
+
+async def get_user_id(current_user: UserClaims = Depends(validate_token)) -> str:
+    """Dependency returning the authenticated user's ID. Resolved once per request and shared across dependants."""
+    return normalize_user_id(current_user.email)
+
+
 def validate_token_from_string(token: str) -> UserClaims:
     """Validates a JWT token string directly."""
     if not AUTH0_DOMAIN or not AUTH0_CLIENT_ID:
         raise HTTPException(status_code=500, detail="Auth0 configuration missing on server.")
 
+    cached_claims = _get_cached_claims(token)
+    if cached_claims:
+        return cached_claims
+
     try:
         unverified_headers = jws.get_unverified_header(token)
         public_key = find_public_key(unverified_headers.get("kid"))
@@ -137,10 +197,12 @@ def validate_token_from_string(token: str) -> UserClaims:
             logger.error("Token missing required claims (name, email): %s", token_payload)
             raise HTTPException(status_code=401, detail="Token missing required claims.")
 
-        return UserClaims(
+        claims = UserClaims(
             name=token_payload["name"],
             email=token_payload["email"],
         )
+        _cache_claims(token, claims, token_payload.get("exp"))
+        return claims
     except ExpiredSignatureError:
         logger.warning("Token validation failed: Expired signature")
         raise HTTPException(status_code=401, detail="Token has expired.")
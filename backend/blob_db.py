@@ -11,18 +11,24 @@ class BlobDB:
         conn_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
         if not conn_str:
             raise ValueError("Azure Storage connection string not found")
-        self.service_client = BlobServiceClient.from_connection_string(conn_str)
+        self.upload_block_size = 1024 * 1024  # Stage uploads in 1MB blocks
+        self.service_client = BlobServiceClient.from_connection_string(conn_str, max_block_size=self.upload_block_size, max_single_put_size=self.upload_block_size)
         self.container_name = "roundtable"
         self.max_file_size = 5 * 1024 * 1024  # 5MB in bytes
+        self.upload_concurrency = 4  # Blocks uploaded in parallel
         self.allowed_extensions = {".txt", ".md", ".pdf"}
+        self.sniff_size = 1024  # Bytes inspected to check the content matches the extension
 
-    async def _validate_file(self, file: UploadFile, filename: str) -> None:
-        """Validate file size, name and type."""
+    async def _validate_file(self, file: UploadFile, filename: str) -> int:
+        """Validate file size, name and type. Returns the file size in bytes."""
         # Check file size
         file.file.seek(0, 2)  # Seek to end
         size = file.file.tell()
         file.file.seek(0)  # Reset position
 
+        if size == 0:
+            raise HTTPException(status_code=400, detail=f"File '{filename}' is empty")
+
         if size > self.max_file_size:
             raise HTTPException(status_code=400, detail=f"File size exceeds maximum limit of {self.max_file_size/1024/1024}MB")
 
@@ -38,6 +44,23 @@ class BlobDB:
         if ext not in self.allowed_extensions:
             raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}")
 
+        # Check the content matches the extension before anything is written to storage
+        header = file.file.read(self.sniff_size)
+        file.file.seek(0)
+        if not self._content_matches_extension(header, ext):
+            raise HTTPException(status_code=400, detail=f"File content does not match its {ext} extension")
+
+        return size
+
+    @staticmethod
+    def _content_matches_extension(header: bytes, ext: str) -> bool:
+        """Sniff the first bytes of a file against the signature expected for its extension."""
+        if ext == ".pdf":
+            # The PDF spec allows the header anywhere in the first 1024 bytes
+            return b"%PDF-" in header
+        # Text files (.txt, .md) must not contain NUL bytes, which only appear in binary content
+        return b"\x00" not in header
+
     async def upload_file(self, file: UploadFile, user_id: str, participant_id: str) -> Dict:
         """Upload a file to Azure Blob Storage."""
         try:
@@ -52,7 +75,7 @@ class BlobDB:
             clean_filename = f"{file_id}{ext}"
 
             # Validate the file
-            await self._validate_file(file, original_filename)
+            size = await self._validate_file(file, original_filename)
 
             # Ensure container exists
             container_client = self.service_client.get_container_client(self.container_name)
@@ -69,8 +92,14 @@ class BlobDB:
             # Set content settings based on file type
             content_settings = ContentSettings(content_type="application/pdf" if ext == ".pdf" else "text/plain")
 
-            # Upload the file
-            blob_client.upload_blob(file.file, content_settings=content_settings, overwrite=True)
+            # Stream the file to storage in fixed-size blocks rather than reading it into memory
+            blob_client.upload_blob(
+                file.file,
+                length=size,
+                content_settings=content_settings,
+                overwrite=True,
+                max_concurrency=self.upload_concurrency,
+            )
 
             return {
                 "file_id": file_id,
@@ -80,10 +109,13 @@ class BlobDB:
                 "clean_name": clean_filename,
                 "user_id": user_id,
                 "path": blob_path,
-                "size": file.file.tell(),
+                "size": size,
                 "type": ext[1:],  # Remove the dot from extension
             }
 
+        except HTTPException:
+            # Validation errors (size, type, content) are client errors, not upload failures
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
@@ -0,0 +1,195 @@
+import os
+import time
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+import orjson
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from logger_config import setup_logger
+
+# Load environment variables
+load_dotenv()
+
+# Set up logger
+logger = setup_logger(__name__)
+
+# Cache configuration
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_PREFIX = "rt"
+MAX_LOCAL_ENTRIES = 10000
+PARTICIPANT_CACHE_TTL = 30  # seconds
+GROUP_CONTEXT_CACHE_TTL = 300  # seconds
+
+
+class CacheClient:
+    """
+    Small async key/value cache.
+
+    Uses Redis when REDIS_URL is set so entries are shared across workers,
+    otherwise falls back to an in-process dictionary. Values are stored as
+    orjson-encoded bytes. Cache failures are logged and treated as misses so
+    they never fail a request.
+    """
+
+    def __init__(self, redis_url: Optional[str] = REDIS_URL, prefix: str = CACHE_PREFIX):
+        self.prefix = prefix
+        self.redis = None
+        self._local: Dict[str, Tuple[float, bytes]] = {}
+        self._counters: Dict[str, Tuple[float, int]] = {}
+
+        if redis_url:
+            from redis import asyncio as aioredis
+
+            self.redis = aioredis.from_url(redis_url)
+            logger.info("Initialized Redis cache client")
+        else:
+            logger.warning("REDIS_URL is not set. Using in-memory cache.")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on a miss."""
+        full_key = self._key(key)
+        try:
+            if self.redis:
+                raw = await self.redis.get(full_key)
+            else:
+                entry = self._local.get(full_key)
+                raw = None
+                if entry:
+                    expires_at, raw = entry
+                    if expires_at < time.monotonic():
+                        self._local.pop(full_key, None)
+                        raw = None
+            return orjson.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning("Cache get failed for key %s: %s", full_key, str(e))
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Cache a JSON-serializable value for ttl seconds."""
+        full_key = self._key(key)
+        try:
+            raw = orjson.dumps(value)
+            if self.redis:
+                await self.redis.set(full_key, raw, ex=ttl)
+            else:
+                if len(self._local) >= MAX_LOCAL_ENTRIES:
+                    self._evict_local()
+                self._local[full_key] = (time.monotonic() + ttl, raw)
+        except Exception as e:
+            logger.warning("Cache set failed for key %s: %s", full_key, str(e))
+
+    async def clear(self, key_prefix: str) -> None:
+        """Delete every cached entry whose key starts with key_prefix."""
+        full_prefix = self._key(key_prefix)
+        try:
+            if self.redis:
+                keys = [key async for key in self.redis.scan_iter(match=f"{full_prefix}*")]
+                if keys:
+                    await self.redis.delete(*keys)
+            else:
+                for key in [k for k in self._local if k.startswith(full_prefix)]:
+                    self._local.pop(key, None)
+            logger.debug("Cleared cache entries with prefix: %s", full_prefix)
+        except Exception as e:
+            # A stale entry expires on its own; never fail the caller because of it
+            logger.warning("Cache clear failed for prefix %s: %s", full_prefix, str(e))
+
+    async def incr(self, key: str, ttl: int) -> Optional[int]:
+        """Increment a counter and return its new value, or None if the cache is unavailable. The counter expires after ttl seconds."""
+        full_key = self._key(key)
+        try:
+            if self.redis:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    count, _ = await pipe.incr(full_key).expire(full_key, ttl).execute()
+                return count
+            now = time.monotonic()
+            expires_at, count = self._counters.get(full_key, (now + ttl, 0))
+            if expires_at < now:
+                expires_at, count = now + ttl, 0
+            if full_key not in self._counters and len(self._counters) >= MAX_LOCAL_ENTRIES:
+                for stale_key in [k for k, (exp, _) in self._counters.items() if exp < now]:
+                    self._counters.pop(stale_key, None)
+                if len(self._counters) >= MAX_LOCAL_ENTRIES:
+                    self._counters.pop(next(iter(self._counters)))
+            self._counters[full_key] = (expires_at, count + 1)
+            return count + 1
+        except Exception as e:
+            logger.warning("Cache incr failed for key %s: %s", full_key, str(e))
+            return None
+
+    def _evict_local(self) -> None:
+        """Drop expired in-memory entries, then the oldest ones if still full."""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._local.items() if expires_at < now]:
+            self._local.pop(key, None)
+        while len(self._local) >= MAX_LOCAL_ENTRIES:
+            self._local.pop(next(iter(self._local)))
+
+
+def compute_etag(payload: Any) -> str:
+    """Compute a weak ETag for a JSON-serializable payload."""
+    return f'W/"{hashlib.blake2b(orjson.dumps(payload), digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque_tag for candidate in if_none_match.split(","))
+
+
+def conditional_response(request: Request, payload: Any, etag: str) -> Response:
+    """
+    Return 304 Not Modified if the client already has this ETag, otherwise the payload with its ETag header set.
+
+    The payload must already be validated and JSON-ready: it is returned as a response object, so
+    FastAPI does not run it through the route's response_model again.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(content=payload, headers={"ETag": etag})
+
+
+def participant_cache_key(user_id: str, participant_id: str) -> str:
+    """Cache key for a single participant read. Always scoped to the user so entries never leak across users."""
+    return f"participant:{user_id}:{participant_id}"
+
+
+def participant_list_cache_key(user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
+    """Cache key for one page of a user's participant list, or the whole list when there is no limit or cursor."""
+    return f"participant:{user_id}:list:{limit or ''}:{cursor or ''}"
+
+
+async def invalidate_participant_cache(user_id: str) -> None:
+    """Drop all cached participant responses for a user."""
+    await cache_client.clear(f"participant:{user_id}:")
+
+
+def group_context_cache_key(user_id: str, group_id: str) -> str:
+    """Cache key for the group context used to build question prompts."""
+    return f"group_ctx:{user_id}:{group_id}"
+
+
+def questions_cache_key(user_id: str, request_key: str) -> str:
+    """Cache key for the questions generated for one topic and group."""
+    return f"questions:{user_id}:{request_key}"
+
+
+async def invalidate_group_context_cache(user_id: str) -> None:
+    """
+    Drop all cached group contexts for a user, and the questions generated from them. Needed on group changes
+    and on participant changes, since contexts embed participant names and roles.
+    """
+    await cache_client.clear(f"group_ctx:{user_id}:")
+    await cache_client.clear(f"questions:{user_id}:")
+
+
+# Create a singleton instance
+cache_client = CacheClient()
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional, Any
+import asyncio
+from typing import Callable, Dict, List, Optional, Any
+from azure.core import MatchConditions
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
 from azure.identity import DefaultAzureCredential
 from fastapi import HTTPException
@@ -6,6 +8,7 @@ import logging
 from logger_config import setup_logger
 import os
 from dotenv import load_dotenv
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +25,16 @@ CHAT_CONTAINER_NAME = "chat_sessions"
 VECTOR_DATABASE_NAME = "roundtable-vector"
 PARTICIPANT_DOCO_CONTAINER_NAME = "participant_docs"
 PARTICIPANT_DOCS_PARTITION_KEY = PartitionKey(path="/participant_id")
+# Transactional batches are limited to 100 operations and 2MB; stay under the size limit with headroom
+BATCH_MAX_OPERATIONS = 100
+BATCH_MAX_BYTES = 1_500_000
+# Conditional replaces of the user document retried after losing a race with a concurrent write
+USER_UPDATE_MAX_ATTEMPTS = 5
+
+
+def _query_items(container, **kwargs) -> List[Any]:
+    """Run a query and read every page. query_items pages lazily, so this must run inside the worker thread too."""
+    return list(container.query_items(**kwargs))
 
 
 class CosmosDBClient:
@@ -46,7 +59,8 @@ class CosmosDBClient:
             # Initialize main database and container
             self.database = self.client.get_database_client(DATABASE_NAME)
             self.container = self.database.get_container_client(CONTAINER_NAME)
-            logger.info(f"Successfully initialized Cosmos DB client for database: {DATABASE_NAME} and container: {CONTAINER_NAME}")
+            self.chat_sessions_container = self.database.get_container_client(CHAT_CONTAINER_NAME)
+            logger.info(f"Successfully initialized Cosmos DB client for database: {DATABASE_NAME} and containers: {CONTAINER_NAME}, {CHAT_CONTAINER_NAME}")
 
             # Initialize vector database and participant docs container
             self.vector_database = self.client.get_database_client(VECTOR_DATABASE_NAME)
@@ -72,7 +86,7 @@ class CosmosDBClient:
     async def get_user_data(self, user_id: str) -> Optional[Dict]:
         """Retrieve user data by user ID and mask API keys."""
         try:
-            response = self.container.read_item(item=user_id, partition_key=user_id)
+            response = await asyncio.to_thread(self.container.read_item, item=user_id, partition_key=user_id)
             return response
         except exceptions.CosmosResourceNotFoundError:
             logger.warning(f"User {user_id} not found")
@@ -104,23 +118,59 @@ class CosmosDBClient:
             logger.error(f"Error getting participant {participant_id}: {str(e)}", exc_info=True)
             raise
 
-    async def update_participant(self, user_id: str, participant_id: str, participant_data: Dict) -> Dict:
-        """Update a participant's data"""
+    async def get_participants_by_ids(self, user_id: str, participant_ids: List[str]) -> Dict[str, Dict]:
+        """Get multiple participants by ID with a single user document read, keyed by participant ID"""
         try:
             user_data = await self.get_user_data(user_id)
             if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+                return {}
+            wanted_ids = set(participant_ids)
+            return {p["id"]: p for p in user_data.get("participants", []) if p.get("id") in wanted_ids}
+        except Exception as e:
+            logger.error(f"Error getting participants for user {user_id}: {str(e)}", exc_info=True)
+            raise
 
-            participants = user_data.get("participants", [])
-            participant_idx = next((i for i, p in enumerate(participants) if p.get("id") == participant_id), -1)
+    async def _modify_user(self, user_id: str, apply_update: Callable[[Dict], None], create_missing: bool = False) -> Dict:
+        """
+        Read-modify-write the user document with optimistic concurrency.
+
+        The replace is conditioned on the ETag of the read, so a concurrent write to the same user makes it
+        fail with 412 instead of silently dropping the other change; the update is then re-applied to a fresh read.
+        apply_update mutates the document in place and may raise HTTPException, e.g. when an item is not found.
+        """
+        for attempt in range(1, USER_UPDATE_MAX_ATTEMPTS + 1):
+            user_data = await self.get_user_data(user_id)
+            if not user_data:
+                if not create_missing:
+                    raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+                try:
+                    user_data = await self.create_user(user_id)
+                except exceptions.CosmosResourceExistsError:
+                    continue  # Created concurrently; read it again
+
+            apply_update(user_data)
+            try:
+                return await asyncio.to_thread(
+                    self.container.replace_item, item=user_id, body=user_data, etag=user_data["_etag"], match_condition=MatchConditions.IfNotModified
+                )
+            except exceptions.CosmosAccessConditionFailedError:
+                logger.info(f"User {user_id} was modified concurrently, retrying update (attempt {attempt})")
+        raise HTTPException(status_code=409, detail="The user was modified concurrently. Please retry.")
+
+    async def update_participant(self, user_id: str, participant_id: str, participant_data: Dict) -> Dict:
+        """Update a participant's data"""
+        try:
+            def apply_update(user_data: Dict) -> None:
+                participants = user_data.get("participants", [])
+                participant_idx = next((i for i, p in enumerate(participants) if p.get("id") == participant_id), -1)
 
-            if participant_idx == -1:
-                raise HTTPException(status_code=404, detail=f"Participant {participant_id} not found")
+                if participant_idx == -1:
+                    raise HTTPException(status_code=404, detail=f"Participant {participant_id} not found")
 
-            participants[participant_idx] = {**participants[participant_idx], **participant_data}
-            user_data["participants"] = participants
+                participants[participant_idx] = {**participants[participant_idx], **participant_data}
+                user_data["participants"] = participants
 
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Updated participant {participant_id} for user {user_id}")
             return response
         except Exception as e:
@@ -130,14 +180,11 @@ class CosmosDBClient:
     async def delete_participant(self, user_id: str, participant_id: str) -> Dict:
         """Delete a participant from the user's data"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-            participants = user_data.get("participants", [])
-            user_data["participants"] = [p for p in participants if p.get("id") != participant_id]
+            def apply_update(user_data: Dict) -> None:
+                participants = user_data.get("participants", [])
+                user_data["participants"] = [p for p in participants if p.get("id") != participant_id]
 
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Deleted participant {participant_id} from user {user_id}")
             return response
         except Exception as e:
@@ -148,7 +195,7 @@ class CosmosDBClient:
         """Create a new user with empty arrays for participants, groups, and meetings"""
         try:
             user_data = {"id": user_id, "participants": [], "groups": [], "meetings": [], "vectors": {}, "llmAccounts": {"default": "", "providers": []}}  # For storing vector data
-            response = self.container.create_item(body=user_data)
+            response = await asyncio.to_thread(self.container.create_item, body=user_data)
             logger.info(f"Created new user: {user_id}")
             return response
         except Exception as e:
@@ -158,15 +205,13 @@ class CosmosDBClient:
     async def add_participant(self, user_id: str, participant_data: Dict) -> Dict:
         """Add a participant to user's participants array"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                user_data = await self.create_user(user_id)
+            def apply_update(user_data: Dict) -> None:
+                participants = user_data.get("participants", [])
+                participants.append(participant_data)
 
-            participants = user_data.get("participants", [])
-            participants.append(participant_data)
+                user_data["participants"] = participants
 
-            user_data["participants"] = participants
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update, create_missing=True)
             logger.info(f"Added participant for user: {user_id}")
             return response
         except Exception as e:
@@ -176,15 +221,13 @@ class CosmosDBClient:
     async def add_group(self, user_id: str, group_data: Dict) -> Dict:
         """Add a group to user's groups array"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                user_data = await self.create_user(user_id)
+            def apply_update(user_data: Dict) -> None:
+                groups = user_data.get("groups", [])
+                groups.append(group_data)
 
-            groups = user_data.get("groups", [])
-            groups.append(group_data)
+                user_data["groups"] = groups
 
-            user_data["groups"] = groups
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update, create_missing=True)
             logger.info(f"Added group for user: {user_id}")
             return response
         except Exception as e:
@@ -217,20 +260,17 @@ class CosmosDBClient:
     async def update_group(self, user_id: str, group_id: str, group_data: Dict) -> Dict:
         """Update a group's data"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+            def apply_update(user_data: Dict) -> None:
+                groups = user_data.get("groups", [])
+                group_idx = next((i for i, g in enumerate(groups) if g.get("id") == group_id), -1)
 
-            groups = user_data.get("groups", [])
-            group_idx = next((i for i, g in enumerate(groups) if g.get("id") == group_id), -1)
-
-            if group_idx == -1:
-                raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
+                if group_idx == -1:
+                    raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
 
-            groups[group_idx] = {**groups[group_idx], **group_data}
-            user_data["groups"] = groups
+                groups[group_idx] = {**groups[group_idx], **group_data}
+                user_data["groups"] = groups
 
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Updated group {group_id} for user {user_id}")
             return response
         except Exception as e:
@@ -240,14 +280,11 @@ class CosmosDBClient:
     async def delete_group(self, user_id: str, group_id: str) -> Dict:
         """Delete a group from the user's data"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+            def apply_update(user_data: Dict) -> None:
+                groups = user_data.get("groups", [])
+                user_data["groups"] = [g for g in groups if g.get("id") != group_id]
 
-            groups = user_data.get("groups", [])
-            user_data["groups"] = [g for g in groups if g.get("id") != group_id]
-
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Deleted group {group_id} from user {user_id}")
             return response
         except Exception as e:
@@ -257,14 +294,11 @@ class CosmosDBClient:
     async def update_user(self, user_id: str, update_data: Dict) -> Dict:
         """Update user data with provided fields"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+            def apply_update(user_data: Dict) -> None:
+                # Update only the specified fields
+                user_data.update(update_data)
 
-            # Update only the specified fields
-            user_data.update(update_data)
-
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Updated user data for user: {user_id}")
             return response
         except Exception as e:
@@ -274,15 +308,13 @@ class CosmosDBClient:
     async def add_meeting(self, user_id: str, meeting_data: Dict) -> Dict:
         """Add a meeting to user's meetings array"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                user_data = await self.create_user(user_id)
+            def apply_update(user_data: Dict) -> None:
+                meetings = user_data.get("meetings", [])
+                meetings.append(meeting_data)
 
-            meetings = user_data.get("meetings", [])
-            meetings.append(meeting_data)
+                user_data["meetings"] = meetings
 
-            user_data["meetings"] = meetings
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update, create_missing=True)
             logger.info(f"Added meeting for user: {user_id}")
             return response
         except Exception as e:
@@ -315,20 +347,17 @@ class CosmosDBClient:
     async def update_meeting(self, user_id: str, meeting_id: str, meeting_data: Dict) -> Dict:
         """Update a meeting's data"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-            meetings = user_data.get("meetings", [])
-            meeting_idx = next((i for i, m in enumerate(meetings) if m.get("id") == meeting_id), -1)
+            def apply_update(user_data: Dict) -> None:
+                meetings = user_data.get("meetings", [])
+                meeting_idx = next((i for i, m in enumerate(meetings) if m.get("id") == meeting_id), -1)
 
-            if meeting_idx == -1:
-                raise HTTPException(status_code=404, detail=f"Meeting {meeting_id} not found")
+                if meeting_idx == -1:
+                    raise HTTPException(status_code=404, detail=f"Meeting {meeting_id} not found")
 
-            meetings[meeting_idx] = {**meetings[meeting_idx], **meeting_data}
-            user_data["meetings"] = meetings
+                meetings[meeting_idx] = {**meetings[meeting_idx], **meeting_data}
+                user_data["meetings"] = meetings
 
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Updated meeting {meeting_id} for user {user_id}")
             return response
         except Exception as e:
@@ -338,14 +367,11 @@ class CosmosDBClient:
     async def delete_meeting(self, user_id: str, meeting_id: str) -> Dict:
         """Delete a meeting from the user's data"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-            meetings = user_data.get("meetings", [])
-            user_data["meetings"] = [m for m in meetings if m.get("id") != meeting_id]
+            def apply_update(user_data: Dict) -> None:
+                meetings = user_data.get("meetings", [])
+                user_data["meetings"] = [m for m in meetings if m.get("id") != meeting_id]
 
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update)
             logger.info(f"Deleted meeting {meeting_id} from user {user_id}")
             return response
         except Exception as e:
@@ -355,15 +381,12 @@ class CosmosDBClient:
     async def store_vector(self, user_id: str, vector_id: str, vector_data: Dict) -> Dict:
         """Store vector data in the user's document"""
         try:
-            user_data = await self.get_user_data(user_id)
-            if not user_data:
-                user_data = await self.create_user(user_id)
+            def apply_update(user_data: Dict) -> None:
+                vectors = user_data.get("vectors", {})
+                vectors[vector_id] = vector_data
+                user_data["vectors"] = vectors
 
-            vectors = user_data.get("vectors", {})
-            vectors[vector_id] = vector_data
-            user_data["vectors"] = vectors
-
-            response = self.container.upsert_item(body=user_data)
+            response = await self._modify_user(user_id, apply_update, create_missing=True)
             logger.info(f"Stored vector {vector_id} for user: {user_id}")
             return response
         except Exception as e:
@@ -404,30 +427,58 @@ class CosmosDBClient:
                 logger.error("Missing 'participant_id' in document chunk data.")
                 raise ValueError("Document chunk data must include 'participant_id'")
 
-            response = container.upsert_item(body=doc_chunk_data)
+            response = await asyncio.to_thread(container.upsert_item, body=doc_chunk_data)
             logger.info(f"Successfully added/updated document chunk with id: {doc_chunk_data.get('id')}")
             return response
         except Exception as e:
             logger.error(f"Error adding document chunk {doc_chunk_data.get('id', 'N/A')}: {str(e)}", exc_info=True)
             raise
 
+    async def add_participant_doc_chunks(self, participant_id: str, doc_chunks: List[Dict]) -> List[str]:
+        """Upsert a participant's document chunks using transactional batches, returning the stored chunk IDs."""
+        try:
+            container = self.get_participant_docs_container()
+            stored_ids = []
+            batch, batch_bytes = [], 0
+            for doc_chunk_data in doc_chunks:
+                if doc_chunk_data.get("participant_id") != participant_id:
+                    raise ValueError("All document chunks in a batch must share the participant_id partition key")
+                chunk_bytes = len(orjson.dumps(doc_chunk_data))
+                if batch and (len(batch) >= BATCH_MAX_OPERATIONS or batch_bytes + chunk_bytes > BATCH_MAX_BYTES):
+                    await asyncio.to_thread(container.execute_item_batch, batch_operations=batch, partition_key=participant_id)
+                    stored_ids.extend(op[1][0]["id"] for op in batch)
+                    batch, batch_bytes = [], 0
+                batch.append(("upsert", (doc_chunk_data,)))
+                batch_bytes += chunk_bytes
+            if batch:
+                await asyncio.to_thread(container.execute_item_batch, batch_operations=batch, partition_key=participant_id)
+                stored_ids.extend(op[1][0]["id"] for op in batch)
+            logger.info(f"Successfully added/updated {len(stored_ids)} document chunks for participant {participant_id}")
+            return stored_ids
+        except Exception as e:
+            logger.error(f"Error adding document chunks for participant {participant_id}: {str(e)}", exc_info=True)
+            raise
+
+    def _delete_items_in_batches(self, container, item_ids: List[str], partition_key: str) -> int:
+        """Delete items from a single partition using transactional batches instead of one request per item."""
+        for start in range(0, len(item_ids), BATCH_MAX_OPERATIONS):
+            batch = [("delete", (item_id,)) for item_id in item_ids[start : start + BATCH_MAX_OPERATIONS]]
+            container.execute_item_batch(batch_operations=batch, partition_key=partition_key)
+        return len(item_ids)
+
     async def delete_participant_docs(self, participant_id: str, user_id: str):
         """Delete all document chunks for a specific participant."""
         # Note: user_id might not be strictly needed if participant_id is unique across users,
         # but it's good practice for potential future authorization checks.
         try:
             container = self.get_participant_docs_container()
-            query = "SELECT * FROM c WHERE c.participant_id = @participant_id"
+            query = "SELECT VALUE c.id FROM c WHERE c.participant_id = @participant_id"
             parameters = [{"name": "@participant_id", "value": participant_id}]
 
-            # Query items using the participant_id as the partition key for efficiency
-            items_to_delete = list(container.query_items(query=query, parameters=parameters, partition_key=participant_id))
+            # Query only the IDs, using the participant_id as the partition key for efficiency
+            ids_to_delete = await asyncio.to_thread(_query_items, container, query=query, parameters=parameters, partition_key=participant_id)
 
-            deleted_count = 0
-            for item in items_to_delete:
-                container.delete_item(item=item["id"], partition_key=participant_id)
-                deleted_count += 1
-                logger.debug(f"Deleted document chunk {item['id']} for participant {participant_id}")
+            deleted_count = await asyncio.to_thread(self._delete_items_in_batches, container, ids_to_delete, participant_id)
 
             logger.info(f"Deleted {deleted_count} document chunks for participant {participant_id}")
 
@@ -474,8 +525,8 @@ class CosmosDBClient:
 
             logger.debug(f"Executing vector search query: {query} with params: {parameters}")
 
-            results = list(
-                container.query_items(query=query, parameters=parameters, enable_cross_partition_query=enable_cross_partition, partition_key=partition_key_param)  # Specify partition key if filtering
+            results = await asyncio.to_thread(
+                _query_items, container, query=query, parameters=parameters, enable_cross_partition_query=enable_cross_partition, partition_key=partition_key_param  # Specify partition key if filtering
             )
 
             logger.info(f"Vector search found {len(results)} results for top_k={top_k}" + (f" and participant_id={participant_id}" if participant_id else ""))
@@ -492,7 +543,7 @@ class CosmosDBClient:
 
     async def get_chat_sessions_container(self):
         """Get the chat sessions container."""
-        return self.client.get_database_client(DATABASE_NAME).get_container_client(CHAT_CONTAINER_NAME)
+        return self.chat_sessions_container
 
     async def get_user_chat_sessions(self, user_id: str) -> list:
         """Get all chat sessions for a user."""
@@ -500,7 +551,7 @@ class CosmosDBClient:
             chat_container = await self.get_chat_sessions_container()
             parameters = [{"name": "@user_id", "value": user_id}]
             query = "SELECT * FROM c WHERE c.user_id = @user_id"
-            return list(chat_container.query_items(query=query, parameters=parameters, partition_key=user_id))
+            return await asyncio.to_thread(_query_items, chat_container, query=query, parameters=parameters, partition_key=user_id)
         except Exception as e:
             logger.error(f"Error getting chat sessions for user {user_id}: {str(e)}")
             raise
@@ -509,7 +560,7 @@ class CosmosDBClient:
         """Get a specific chat session."""
         try:
             chat_container = await self.get_chat_sessions_container()
-            return chat_container.read_item(item=session_id, partition_key=user_id)
+            return await asyncio.to_thread(chat_container.read_item, item=session_id, partition_key=user_id)
         except Exception as e:
             logger.error(f"Error getting chat session {session_id}: {str(e)}")
             raise
@@ -518,7 +569,7 @@ class CosmosDBClient:
         """Create a new chat session."""
         try:
             chat_container = await self.get_chat_sessions_container()
-            return chat_container.upsert_item(body=session_data)
+            return await asyncio.to_thread(chat_container.upsert_item, body=session_data)
         except Exception as e:
             logger.error(f"Error creating chat session: {str(e)}")
             raise
@@ -527,7 +578,7 @@ class CosmosDBClient:
         """Update a chat session."""
         try:
             chat_container = await self.get_chat_sessions_container()
-            return chat_container.upsert_item(body=session_data)
+            return await asyncio.to_thread(chat_container.upsert_item, body=session_data)
         except Exception as e:
             logger.error(f"Error updating chat session: {str(e)}")
             raise
@@ -536,7 +587,7 @@ class CosmosDBClient:
         """Delete a chat session."""
         try:
             chat_container = await self.get_chat_sessions_container()
-            chat_container.delete_item(item=session_id, partition_key=user_id)
+            await asyncio.to_thread(chat_container.delete_item, item=session_id, partition_key=user_id)
         except Exception as e:
             logger.error(f"Error deleting chat session {session_id}: {str(e)}")
             raise
@@ -547,22 +598,40 @@ class CosmosDBClient:
             chat_container = await self.get_chat_sessions_container()
             # Use parameterized query
             parameters = [{"name": "@meeting_id", "value": meeting_id}, {"name": "@user_id", "value": user_id}]
-            query = "SELECT * FROM c WHERE c.meeting_id = @meeting_id AND c.user_id = @user_id"
-            sessions = list(chat_container.query_items(query=query, parameters=parameters, partition_key=user_id))
+            query = "SELECT VALUE c.id FROM c WHERE c.meeting_id = @meeting_id AND c.user_id = @user_id"
+            session_ids = await asyncio.to_thread(_query_items, chat_container, query=query, parameters=parameters, partition_key=user_id)
 
-            for session in sessions:
-                chat_container.delete_item(item=session["id"], partition_key=user_id)
-                logger.info(f"Deleted chat session {session['id']} for meeting {meeting_id}")
+            deleted_count = await asyncio.to_thread(self._delete_items_in_batches, chat_container, session_ids, user_id)
+            logger.info(f"Deleted {deleted_count} chat sessions for meeting {meeting_id}")
         except Exception as e:
             logger.error(f"Error deleting chat sessions for meeting {meeting_id}: {str(e)}")
             raise
 
+    async def get_user_summary(self, user_id: str) -> Optional[Dict]:
+        """Get a user's profile fields and collection counts in one query, without reading the embedded collections"""
+        try:
+            parameters = [{"name": "@user_id", "value": user_id}]
+            query = (
+                "SELECT c.id AS user_id, c.display_name, c.email, "
+                "ARRAY_LENGTH(c.llmAccounts.providers) AS llm_providers_count, "
+                "ARRAY_LENGTH(c.participants) AS participants_count, "
+                "ARRAY_LENGTH(c.meetings) AS meetings_count, "
+                "ARRAY_LENGTH(c.groups) AS groups_count, "
+                "ARRAY_LENGTH(c.chat_sessions) AS chat_sessions_count "
+                "FROM c WHERE c.id = @user_id"
+            )
+            result = await asyncio.to_thread(_query_items, self.container, query=query, parameters=parameters, partition_key=user_id)
+            return result[0] if result else None
+        except Exception as e:
+            logger.error(f"Error getting user summary for user {user_id}: {str(e)}", exc_info=True)
+            raise
+
     async def get_user_llm_settings(self, user_id: str) -> dict:
         """Get LLM settings for a user."""
         try:
             parameters = [{"name": "@user_id", "value": user_id}]
             query = "SELECT c.llmAccounts FROM c WHERE c.id = @user_id"
-            result = list(self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+            result = await asyncio.to_thread(_query_items, self.container, query=query, parameters=parameters, enable_cross_partition_query=True)
             return result[0] if result else None
         except Exception as e:
             logger.error(f"Error getting LLM settings for user {user_id}: {str(e)}")
@@ -592,8 +661,6 @@ except Exception as e:
     raise
 
 if __name__ == "__main__":
-    import asyncio
-
     async def run_test():
         try:
             result = await cosmos_client.test_connection()
@@ -1,4 +1,4 @@
-import json
+import orjson
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 import asyncio
@@ -37,7 +37,7 @@ async def _fetch_and_filter_knowledge(user_id: str, participant_id: str, search_
 # SSE event formatting
 def format_sse_event(event_type: str, data: dict) -> str:
     try:
-        return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+        return f"event: {event_type}\ndata: {orjson.dumps(data).decode()}\n\n"
     except Exception as e:
         logger.error("Failed to format SSE event: %s", str(e))
         raise
@@ -69,13 +69,12 @@ class MeetingDiscussion:
                     "order": order.order,
                     "related_knowledge": [],  # Initialize related_knowledge
                 }
+        self._system_prompts = {}  # participant_id -> system prompt, built on first question
         logger.info("Initialized meeting discussion for user '%s'", self.user_id)
 
-    def ask_question(self, llm_client, participant_id: str, question: str, messages_list=None):
-        """Ask a question to a participant with concise, conversational response."""
+    def _build_system_prompt(self, participant_id: str) -> str:
+        """Build a participant's system prompt, which is the same for every question in the meeting."""
         participant = self.participants[participant_id]
-
-        # Part 1: System Prompt
         participant_list = [f"{p['name']} ({p['role']})" for p in self.participants.values()]
         system_prompt = (
             f"You are {participant['persona_description']}. "
@@ -93,6 +92,14 @@ class MeetingDiscussion:
             knowledge_context += "\n".join([f"- {item.get('text_chunk', 'N/A')}" for item in related_knowledge])  # Simplified for context length
             # knowledge_context += "\n".join([f"- {item.get('text_chunk', 'N/A')} (Similarity: {item.get('similarityScore', 0):.2f})" for item in related_knowledge])
             system_prompt += knowledge_context
+        return system_prompt
+
+    def _question_messages(self, participant_id: str, question: str, messages_list=None):
+        """Build the messages asking a participant a question, recording the moderator's question in the chat session."""
+        # Part 1: System Prompt
+        system_prompt = self._system_prompts.get(participant_id)
+        if system_prompt is None:
+            system_prompt = self._system_prompts[participant_id] = self._build_system_prompt(participant_id)
 
         # Part 2: Message History
         messages = [{"role": "system", "content": system_prompt}]
@@ -100,14 +107,18 @@ class MeetingDiscussion:
             messages.extend(messages_list)
 
         # Part 3: Current Question
-        moderator_ques = res = json.dumps({"name": "Moderator", "content": f"Please provide a concise response in a conversational manner to this question based on the meeting topic: {question}"})
+        moderator_ques = res = orjson.dumps({"name": "Moderator", "content": f"Please provide a concise response in a conversational manner to this question based on the meeting topic: {question}"}).decode()
         messages.append({"role": "user", "content": moderator_ques})
         self.chat_session["messages"].append({"role": "user", "content": moderator_ques})
+        return messages
 
-        response, _ = llm_client.send_request(messages)  # Unpack tuple, ignore token stats
-        return response.strip()
+    async def ask_question(self, llm_client, participant_id: str, question: str, messages_list=None):
+        """Ask a question to a participant with concise, conversational response, yielding the answer text as it streams in."""
+        messages = self._question_messages(participant_id, question, messages_list)
+        async for chunk in llm_client.astream_request(messages):
+            yield chunk
 
-    def gauge_opinion_strength(self, llm_client, participant_id: str, question: str):
+    async def gauge_opinion_strength(self, llm_client, participant_id: str, question: str):
         """Gauge how strongly a participant feels about a question."""
         participant = self.participants[participant_id]
         prompt = (
@@ -117,7 +128,7 @@ class MeetingDiscussion:
             f"Respond with just a number (e.g., '7'). If no opinion, respond '0'."
         )
         messages = [{"role": "system", "content": prompt}, {"role": "user", "content": question}]
-        response, _ = llm_client.send_request(messages)  # Unpack tuple, ignore token stats
+        response, _ = await llm_client.asend_request(messages)  # Unpack tuple, ignore token stats
         try:
             return int(response.strip())
         except ValueError:
@@ -166,7 +177,7 @@ class MeetingDiscussion:
         )
 
         # Get response
-        response, _ = llm_client.send_request(messages)  # Unpack tuple, ignore token stats
+        response, _ = await llm_client.asend_request(messages)  # Unpack tuple, ignore token stats
         response = response.strip()
 
         # Create/update chat session
@@ -229,10 +240,15 @@ class MeetingDiscussion:
                     yield format_sse_event("next_participant", {"participant_id": pid, "participant_name": self.participants[pid]["name"]})
                     await asyncio.sleep(0.1)  # Add delay before response
 
-                    answer = self.ask_question(llm_client, pid, question, self.message_history)
+                    # Stream the answer to the client as it is generated, then record the full answer
+                    chunks = []
+                    async for chunk in self.ask_question(llm_client, pid, question, self.message_history):
+                        chunks.append(chunk)
+                        yield format_sse_event("participant_response_delta", {"participant_id": pid, "participant": self.participants[pid]["name"], "delta": chunk})
+                    answer = "".join(chunks).strip()
                     # Add to discussion log
                     self.discussion_log.append({"participant": self.participants[pid]["name"], "question": question, "answer": answer})
-                    res = json.dumps({"name": self.participants[pid]["name"], "content": answer})
+                    res = orjson.dumps({"name": self.participants[pid]["name"], "content": answer}).decode()
                     self.message_history.append({"role": "user", "content": res})
                     # Add to chat session
                     self.chat_session["messages"].append({"role": "user", "content": answer})
@@ -253,10 +269,9 @@ class MeetingDiscussion:
 
         elif self.strategy == "opinionated":
             for question in self.questions:
-                opinions = {}
-                for pid in self.participants:
-                    strength = self.gauge_opinion_strength(llm_client, pid, question)
-                    opinions[pid] = strength
+                # Opinion strengths are independent of each other, so gauge all participants concurrently
+                strengths = await asyncio.gather(*(self.gauge_opinion_strength(llm_client, pid, question) for pid in self.participants))
+                opinions = dict(zip(self.participants, strengths))
 
                 sorted_participants = sorted(opinions.items(), key=lambda x: x[1], reverse=True)
                 for pid, strength in sorted_participants:
@@ -265,7 +280,12 @@ class MeetingDiscussion:
                         yield format_sse_event("next_participant", {"participant_id": pid, "participant_name": self.participants[pid]["name"]})
                         await asyncio.sleep(0.1)  # Add delay before response
 
-                        answer = self.ask_question(llm_client, pid, question, self.message_history)
+                        # Stream the answer to the client as it is generated, then record the full answer
+                        chunks = []
+                        async for chunk in self.ask_question(llm_client, pid, question, self.message_history):
+                            chunks.append(chunk)
+                            yield format_sse_event("participant_response_delta", {"participant_id": pid, "participant": self.participants[pid]["name"], "delta": chunk})
+                        answer = "".join(chunks).strip()
                         # Add to discussion log
                         self.discussion_log.append({"participant": self.participants[pid]["name"], "question": question, "answer": answer, "strength": strength})
                         # Add to message history
@@ -308,24 +328,25 @@ class MeetingDiscussion:
                 logger.error("Invalid meeting: must be chat strategy with exactly one participant")
                 raise HTTPException(status_code=400, detail="Invalid meeting: must be chat strategy with exactly one participant")
 
-            # Get or create chat session
-            if not chat_request.session_id:
-                chat_session = await create_chat_session(chat_request.meeting_id, self.user_id, next(iter(self.participants.keys())))
-                session_id = chat_session["id"]
-            else:
+            # Get participant details
+            participant_id = next(iter(self.participants.keys()))
+            participant_info = self.participants[participant_id]
+
+            async def get_chat_session():
                 try:
-                    chat_session = await cosmos_client.get_chat_session(chat_request.session_id, self.user_id)
-                    session_id = chat_request.session_id
+                    return await cosmos_client.get_chat_session(chat_request.session_id, self.user_id)
                 except Exception as e:
                     logger.error(f"Error retrieving chat session: {str(e)}")
                     raise HTTPException(status_code=404, detail="Chat session not found")
 
-            # Get participant details
-            participant_id = next(iter(self.participants.keys()))
-            participant_info = self.participants[participant_id]
-
-            # Get LLM client (moved earlier)
-            llm_client = await get_llm_client(self.user_id)
+            # An existing chat session, the LLM client and the user profile are independent, so fetch them concurrently.
+            # A new session is only created once the others succeed, so a failed request never leaves an orphaned session.
+            if chat_request.session_id:
+                chat_session, llm_client, user_info = await asyncio.gather(get_chat_session(), get_llm_client(self.user_id), get_me(self.user_id))
+            else:
+                llm_client, user_info = await asyncio.gather(get_llm_client(self.user_id), get_me(self.user_id))
+                chat_session = await create_chat_session(chat_request.meeting_id, self.user_id, participant_id)
+            session_id = chat_request.session_id or chat_session["id"]
 
             # --- Generate Summary for Knowledge Search ---
             search_text = chat_request.user_message  # Default search text
@@ -347,7 +368,7 @@ class MeetingDiscussion:
                     summary_messages.append({"role": "user", "content": f"{msg['role']}: {msg['content']}"})
 
                 try:
-                    summary_response, _ = llm_client.send_request(summary_messages)
+                    summary_response, _ = await llm_client.asend_request(summary_messages)
                     search_text = summary_response.strip()
                     logger.info(f"Generated summary for knowledge search: '{search_text[:100]}...'")
                 except Exception as e:
@@ -359,8 +380,6 @@ class MeetingDiscussion:
                 user_id=self.user_id, participant_id=participant_id, search_text=search_text, top_k=3, score_threshold=0.80  # Use summary or fallback
             )
 
-            user_info = await get_me(self.user_id)
-
             # Create system prompt from participant details
             system_prompt_base = (
                 f"You are {participant_info['persona_description']}. "
@@ -371,12 +390,14 @@ class MeetingDiscussion:
                 f"For the first response, say Hi to the user like Hi {user_info['name']} and introducing yourself briefly along with the response "
             )
 
-            # Add related knowledge to the system prompt if available
+            # The system prompt stays the same for the whole session, so the stored history is a stable prefix the
+            # provider can serve from its prompt cache. Per-message knowledge goes in a separate message instead.
             system_prompt = system_prompt_base
+            knowledge_message = None
             if related_knowledge:
-                knowledge_context = "\n\nRelevant background information for you based on your knowledge base. Base your response on the knowledge found below if relevant:\n"
+                knowledge_context = "Relevant background information for you based on your knowledge base. Base your response on the knowledge found below if relevant:\n"
                 knowledge_context += "\n".join([f"- {item.get('text_chunk', 'N/A')}" for item in related_knowledge])
-                system_prompt += knowledge_context
+                knowledge_message = {"role": "system", "content": knowledge_context}
 
             # If this is a new chat session or the system prompt has changed, update/add it
             # We check if the first message is a system message and if its content differs
@@ -402,9 +423,11 @@ class MeetingDiscussion:
 
             # LLM client already initialized earlier for summary/knowledge search
 
-            # Send complete history to LLM
+            # Send complete history to LLM, with this message's knowledge just before the user message
             messages = chat_session["messages"]
-            response, _ = llm_client.send_request(messages)
+            if knowledge_message:
+                messages = messages[:-1] + [knowledge_message, messages[-1]]
+            response, _ = await llm_client.asend_request(messages)
 
             # Add assistant's response to history
             chat_session["messages"].append({"role": "assistant", "content": response})
@@ -23,6 +23,20 @@ async def get_user_chat_sessions(user_id: str) -> list:
     try:
         chat_sessions = await cosmos_client.get_user_chat_sessions(user_id)
 
+        # Sessions of the same meeting share its details, so each meeting and group is fetched once per request.
+        # Failures are memoized too, so a missing meeting is not looked up again for every one of its sessions.
+        loaded = {}
+
+        async def load_once(key: tuple, fetch):
+            if key not in loaded:
+                try:
+                    loaded[key] = await fetch()
+                except Exception as e:
+                    loaded[key] = e
+            if isinstance(loaded[key], Exception):
+                raise loaded[key]
+            return loaded[key]
+
         # Enhance each chat session with meeting details
         enhanced_sessions = []
         for session in chat_sessions:
@@ -30,7 +44,7 @@ async def get_user_chat_sessions(user_id: str) -> list:
             meeting_id = session.get("meeting_id")
             if meeting_id:
                 try:
-                    meeting = await get_meeting(meeting_id, user_id)
+                    meeting = await load_once(("meeting", meeting_id), lambda: get_meeting(meeting_id, user_id))
 
                     # Add meeting details to the session
                     session["meeting_topic"] = meeting.topic
@@ -42,7 +56,7 @@ async def get_user_chat_sessions(user_id: str) -> list:
                     if meeting.group_ids and len(meeting.group_ids) > 0:
                         group_id = meeting.group_ids[0]  # Get the first group_id
                         try:
-                            group = await get_group(group_id, user_id)
+                            group = await load_once(("group", group_id), lambda: get_group(group_id, user_id))
                             if group:
                                 session["group_name"] = group.get("name")
                                 session["group_id"] = group.get("id")
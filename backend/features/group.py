@@ -67,9 +67,9 @@ async def create_group(group: GroupCreate):
 
     try:
         # Validate all participant IDs exist
+        participants_by_id = await cosmos_client.get_participants_by_ids(group.user_id, group.participant_ids)
         for participant_id in group.participant_ids:
-            participant = await cosmos_client.get_participant(group.user_id, participant_id)
-            if not participant:
+            if participant_id not in participants_by_id:
                 logger.error("Participant not found: %s", participant_id)
                 raise HTTPException(status_code=404, detail=f"Participant ID '{participant_id}' not found")
 
@@ -87,7 +87,7 @@ async def create_group(group: GroupCreate):
         # Fetch participant details for the response
         participants_details = []
         for p_id in group.participant_ids:
-            participant = await cosmos_client.get_participant(group.user_id, p_id)
+            participant = participants_by_id.get(p_id)
             if participant:
                 participants_details.append({"id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role")})
 
@@ -119,9 +119,9 @@ async def update_group(group_id: str, group: GroupUpdate):
             raise HTTPException(status_code=404, detail=f"Group with ID '{group_id}' not found")
 
         # Validate all participant IDs exist
+        participants_by_id = await cosmos_client.get_participants_by_ids(group.user_id, group.participant_ids)
         for participant_id in group.participant_ids:
-            participant = await cosmos_client.get_participant(group.user_id, participant_id)
-            if not participant:
+            if participant_id not in participants_by_id:
                 logger.error("Participant not found: %s", participant_id)
                 raise HTTPException(status_code=404, detail=f"Participant ID '{participant_id}' not found")
 
@@ -134,7 +134,7 @@ async def update_group(group_id: str, group: GroupUpdate):
         # Fetch participant details for the response
         participants_details = []
         for p_id in group.participant_ids:
-            participant = await cosmos_client.get_participant(group.user_id, p_id)
+            participant = participants_by_id.get(p_id)
             if participant:
                 participants_details.append({"id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role")})
 
@@ -189,8 +189,9 @@ async def get_group(group_id: str, user_id: str):
 
         # Fetch participant details
         participants = []
+        participants_by_id = await cosmos_client.get_participants_by_ids(user_id, group.get("participant_ids", []))
         for participant_id in group.get("participant_ids", []):
-            participant = await cosmos_client.get_participant(user_id, participant_id)
+            participant = participants_by_id.get(participant_id)
             if participant:
                 participants.append({"id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role")})
 
@@ -213,10 +214,14 @@ async def list_groups(user_id: str):
         groups = await cosmos_client.list_groups(user_id)
         groups_data = []
 
+        # Fetch participants for all groups in one lookup
+        all_participant_ids = {pid for group in groups for pid in group.get("participant_ids", [])}
+        participants_by_id = await cosmos_client.get_participants_by_ids(user_id, list(all_participant_ids))
+
         for group in groups:
             participants = []
             for participant_id in group.get("participant_ids", []):
-                participant = await cosmos_client.get_participant(user_id, participant_id)
+                participant = participants_by_id.get(participant_id)
                 if participant:
                     participants.append({"participant_id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role")})
                 else:
@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
+import time
 from logger_config import setup_logger
 from cosmos_db import cosmos_client
 from utils_llm import LLMClient
@@ -8,6 +9,18 @@ from utils_llm import LLMClient
 # Set up logger
 logger = setup_logger(__name__)
 
+# Default provider details per user, so get_llm_client doesn't read Cosmos DB on every LLM call.
+# Kept in-process rather than in the shared cache because they hold API keys. Entries are dropped on
+# any LLM account change here; the short TTL bounds staleness for changes made through other workers.
+PROVIDER_DETAILS_CACHE_TTL = 30  # seconds
+MAX_CACHED_PROVIDER_DETAILS = 1024
+_provider_details_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+def invalidate_provider_details_cache(user_id: str) -> None:
+    """Drop a user's cached default provider details."""
+    _provider_details_cache.pop(user_id, None)
+
 
 class LLMProvider(BaseModel):
     provider: str
@@ -16,6 +29,8 @@ class LLMProvider(BaseModel):
     deployment_name: Optional[str] = None
     endpoint: Optional[str] = None
     api_version: Optional[str] = None
+    rate_limit_rpm: Optional[int] = Field(default=None, gt=0)
+    rate_limit_tpm: Optional[int] = Field(default=None, gt=0)
 
 
 class LLMAccounts(BaseModel):
@@ -38,6 +53,8 @@ class LLMAccountCreate(BaseModel):
     deployment_name: Optional[str] = None
     endpoint: Optional[str] = None
     api_version: Optional[str] = None
+    rate_limit_rpm: Optional[int] = Field(default=None, gt=0)
+    rate_limit_tpm: Optional[int] = Field(default=None, gt=0)
     user_id: str = Field(default="roundtable_ai_admin", min_length=1)
 
 
@@ -74,6 +91,10 @@ async def create_llm_account(llm: LLMAccountCreate):
             provider_data["endpoint"] = llm.endpoint
         if llm.api_version:
             provider_data["api_version"] = llm.api_version
+        if llm.rate_limit_rpm:
+            provider_data["rate_limit_rpm"] = llm.rate_limit_rpm
+        if llm.rate_limit_tpm:
+            provider_data["rate_limit_tpm"] = llm.rate_limit_tpm
 
         # If this is the first provider, set it as default
         if not providers:
@@ -84,6 +105,7 @@ async def create_llm_account(llm: LLMAccountCreate):
 
         # Update user data
         await cosmos_client.update_user(llm.user_id, {"llmAccounts": llm_accounts})
+        invalidate_provider_details_cache(llm.user_id)
 
         logger.info("Successfully created LLM account for provider: %s", llm.provider)
         return {"message": f"LLM account for provider '{llm.provider}' created successfully"}
@@ -120,11 +142,16 @@ async def update_llm_account(provider: str, llm: LLMAccountUpdate):
                     p["endpoint"] = llm.endpoint
                 if llm.api_version:
                     p["api_version"] = llm.api_version
+                if llm.rate_limit_rpm:
+                    p["rate_limit_rpm"] = llm.rate_limit_rpm
+                if llm.rate_limit_tpm:
+                    p["rate_limit_tpm"] = llm.rate_limit_tpm
                 break
         else:
             raise HTTPException(status_code=404, detail=f"Provider '{provider}' not found")
 
         await cosmos_client.update_user(llm.user_id, {"llmAccounts": llm_accounts})
+        invalidate_provider_details_cache(llm.user_id)
 
         logger.info("Successfully updated LLM account for provider: %s", provider)
         return {"message": f"LLM account for provider '{provider}' updated successfully"}
@@ -160,6 +187,7 @@ async def delete_llm_account(provider: str, user_id: str):
         llm_accounts["providers"] = providers
 
         await cosmos_client.update_user(user_id, {"llmAccounts": llm_accounts})
+        invalidate_provider_details_cache(user_id)
 
         logger.info("Successfully deleted LLM account for provider: %s", provider)
         return {"message": f"LLM account for provider '{provider}' deleted successfully"}
@@ -213,6 +241,7 @@ async def set_default_provider(provider: str, user_id: str):
         llm_accounts["default"] = provider
 
         await cosmos_client.update_user(user_id, {"llmAccounts": llm_accounts})
+        invalidate_provider_details_cache(user_id)
 
         logger.info("Successfully set default provider to: %s", provider)
         return {"message": f"Default provider set to '{provider}' successfully"}
@@ -227,6 +256,10 @@ async def set_default_provider(provider: str, user_id: str):
 async def get_llm_client(user_id: str):
     """Initialize and return an LLM client for the given user."""
     try:
+        cached = _provider_details_cache.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            return LLMClient(cached[1])
+
         # Get LLM settings using cosmos_db client
         llm_settings = await cosmos_client.get_user_llm_settings(user_id)
 
@@ -258,6 +291,9 @@ async def get_llm_client(user_id: str):
 
         # Initialize LLM client with provider details
         client = LLMClient(provider_details)
+        if len(_provider_details_cache) >= MAX_CACHED_PROVIDER_DETAILS:
+            _provider_details_cache.pop(next(iter(_provider_details_cache)))
+        _provider_details_cache[user_id] = (time.monotonic() + PROVIDER_DETAILS_CACHE_TTL, provider_details)
         logger.debug(f"Initialized LLM client with provider: {default_provider}")
         return client
 
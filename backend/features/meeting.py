@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 import json
 import uuid
+from time import time
 from logger_config import setup_logger
 from cosmos_db import cosmos_client
 
@@ -128,8 +129,6 @@ async def create_meeting(meeting: MeetingCreate):
 
         # Create meeting data
         # Add timestamp for meeting creation
-        from time import time
-
         creation_ts = time()
 
         meeting_data = {
@@ -167,6 +166,10 @@ async def list_meetings(user_id: str):
         # Sort meetings by _ts in descending order
         sorted_meetings = sorted(meetings, key=lambda x: x.get("_ts", 0), reverse=True)
 
+        # Fetch participants for all meetings in one lookup
+        all_participant_ids = {pid for meeting in meetings for pid in meeting.get("participant_ids", [])}
+        participants_by_id = await cosmos_client.get_participants_by_ids(user_id, list(all_participant_ids))
+
         for meeting in sorted_meetings:
             meeting_data = {
                 "id": meeting.get("id"),
@@ -183,7 +186,7 @@ async def list_meetings(user_id: str):
 
             # Fetch participant details
             for participant_id in meeting_data["participant_ids"]:
-                participant = await cosmos_client.get_participant(user_id, participant_id)
+                participant = participants_by_id.get(participant_id)
                 if participant:
                     meeting_data["participants"].append(
                         {"id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role"), "persona_description": participant.get("persona_description")}
@@ -212,8 +215,9 @@ async def get_meeting(meeting_id: str, user_id: str) -> Meeting:
             raise HTTPException(status_code=404, detail=f"Meeting ID '{meeting_id}' not found")
 
         participant_details = []
+        participants_by_id = await cosmos_client.get_participants_by_ids(user_id, meeting_data.get("participant_ids", []))
         for participant_id in meeting_data.get("participant_ids", []):
-            participant = await cosmos_client.get_participant(user_id, participant_id)
+            participant = participants_by_id.get(participant_id)
             if participant:
                 participant_details.append(
                     {"participant_id": participant.get("id"), "name": participant.get("name"), "role": participant.get("role"), "persona_description": participant.get("persona_description")}
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import HTTPException, UploadFile
 from pydantic import BaseModel, Field, validator
 from uuid import uuid4
@@ -7,12 +8,14 @@ from logger_config import setup_logger
 from cosmos_db import cosmos_client
 from blob_db import blob_db
 from features.llm import get_llm_client
-from utils.file_reader import read_file_content, get_supported_extensions  # Added import
+from utils.file_reader import read_file_content, get_supported_extensions, SUPPORTED_EXTENSIONS_DISPLAY  # Added import
 
 logger = setup_logger(__name__)
 
 DEFAULT_CHUNK_SIZE = 5000
 DEFAULT_CHUNK_OVERLAP = 250
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 
 def chunk_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[str]:
@@ -92,17 +95,17 @@ def validate_participant_data(data: dict) -> None:
         for field, max_length in required_fields:
             value = data.get(field)
             if not value or not str(value).strip():
-                logger.error(f"Validation failed: Required field '{field}' is empty or whitespace")
+                logger.error("Validation failed: Required field '%s' is empty or whitespace", field)
                 raise HTTPException(status_code=400, detail=f"{field.replace('_', ' ').title()} is required and cannot be empty")
             if len(str(value)) > max_length:
-                logger.error(f"Validation failed: Required field '{field}' length exceeds {max_length} characters")
+                logger.error("Validation failed: Required field '%s' length exceeds %s characters", field, max_length)
                 raise HTTPException(status_code=400, detail=f"{field.replace('_', ' ').title()} must be less than {max_length} characters")
 
         # Check optional fields max length if they exist and are not None
         for field, max_length in optional_fields_max_length.items():
             value = data.get(field)
             if value is not None and len(str(value)) > max_length:
-                logger.error(f"Validation failed: Optional field '{field}' length exceeds {max_length} characters")
+                logger.error("Validation failed: Optional field '%s' length exceeds %s characters", field, max_length)
                 raise HTTPException(status_code=400, detail=f"{field.replace('_', ' ').title()} must be less than {max_length} characters if provided")
 
         logger.debug("Participant data validation successful")
@@ -240,11 +243,11 @@ async def delete_participant(participant_id: str, user_id: str) -> dict:
     Deletes a Participant, associated document chunks from Cosmos DB,
     and associated files from Blob Storage.
     """
-    logger.info(f"Initiating deletion for participant ID: {participant_id}, user ID: {user_id}")
+    logger.info("Initiating deletion for participant ID: %s, user ID: %s", participant_id, user_id)
 
     participant_exists = await cosmos_client.get_participant(user_id, participant_id)
     if not participant_exists:
-        logger.error(f"Participant not found with ID: {participant_id} for user {user_id}")
+        logger.error("Participant not found with ID: %s for user %s", participant_id, user_id)
         raise HTTPException(status_code=404, detail=f"Participant with ID '{participant_id}' not found")
 
     try:
@@ -257,25 +260,25 @@ async def delete_participant(participant_id: str, user_id: str) -> dict:
         for blob_path in unique_blob_paths:
             try:
                 await blob_db.delete_file(user_id, participant_id, blob_path)
-                logger.debug(f"Deleted blob file: {blob_path}")
+                logger.debug("Deleted blob file: %s", blob_path)
             except Exception as e:
-                logger.warning(f"Failed to delete blob file {blob_path} for participant {participant_id}: {str(e)}")
+                logger.warning("Failed to delete blob file %s for participant %s: %s", blob_path, participant_id, str(e))
 
         try:
             await cosmos_client.delete_participant_docs(participant_id, user_id)
-            logger.info(f"Successfully deleted document chunks from Cosmos DB for participant {participant_id}.")
+            logger.info("Successfully deleted document chunks from Cosmos DB for participant %s.", participant_id)
         except Exception as e:
-            logger.error(f"Failed to delete document chunks from Cosmos DB for participant {participant_id}: {str(e)}", exc_info=True)
+            logger.error("Failed to delete document chunks from Cosmos DB for participant %s: %s", participant_id, str(e), exc_info=True)
 
         await cosmos_client.delete_participant(user_id, participant_id)
-        logger.info(f"Successfully deleted participant record: {participant_id} for user: {user_id}")
+        logger.info("Successfully deleted participant record: %s for user: %s", participant_id, user_id)
 
         return {"deleted_id": participant_id, "message": "Participant and associated data deleted successfully."}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error during deletion of participant {participant_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during deletion of participant %s: %s", participant_id, str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error during participant deletion process.")
 
 
@@ -299,15 +302,37 @@ async def get_participant(participant_id: str, user_id: str) -> ParticipantRespo
         raise HTTPException(status_code=500, detail="Internal server error while retrieving participant")
 
 
-async def list_participants(user_id: str) -> dict:
-    """List all Participants for a user."""
+async def list_participants(user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None) -> dict:
+    """
+    List a page of Participants for a user, or all of them when neither limit nor cursor is given.
+
+    The cursor is the ID of the last participant on the previous page, so pages stay
+    stable when participants before it are added or removed.
+    """
     try:
-        logger.info("Fetching all participants for user: %s", user_id)
+        logger.info("Fetching participants for user: %s (limit: %s, cursor: %s)", user_id, limit, cursor)
         participants_list = await cosmos_client.list_participants(user_id)
+        if limit is None and cursor is None:
+            logger.info("Successfully retrieved %d participants for user: %s", len(participants_list), user_id)
+            return {"participants": participants_list, "next_cursor": None}
+        limit = limit or DEFAULT_PAGE_SIZE
+
+        start_index = 0
+        if cursor:
+            start_index = next((i + 1 for i, p in enumerate(participants_list) if p.get("id") == cursor), None)
+            if start_index is None:
+                logger.warning("Invalid participants cursor %s for user: %s", cursor, user_id)
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        page = participants_list[start_index : start_index + limit]
+        has_more = start_index + limit < len(participants_list)
+        next_cursor = page[-1]["id"] if has_more and page else None
 
-        logger.info("Successfully retrieved %d participants for user: %s", len(participants_list), user_id)
-        return {"participants": participants_list}
+        logger.info("Successfully retrieved %d participants for user: %s", len(page), user_id)
+        return {"participants": page, "next_cursor": next_cursor}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error listing participants for user %s: %s", user_id, str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error while retrieving participants")
@@ -318,12 +343,12 @@ async def list_participant_documents(participant_id: str, user_id: str) -> dict:
     Lists a summary of documents associated with a participant by querying
     the participant_docs container.
     """
-    logger.info(f"Fetching document summaries for participant ID: {participant_id}, user ID: {user_id}")
+    logger.info("Fetching document summaries for participant ID: %s, user ID: %s", participant_id, user_id)
 
     # 1. Check Participant Existence
     participant = await cosmos_client.get_participant(user_id, participant_id)
     if not participant:
-        logger.error(f"Participant not found with ID: {participant_id}")
+        logger.error("Participant not found with ID: %s", participant_id)
         raise HTTPException(status_code=404, detail=f"Participant with ID '{participant_id}' not found")
 
     try:
@@ -340,7 +365,7 @@ async def list_participant_documents(participant_id: str, user_id: str) -> dict:
         for chunk in all_chunks:
             file_id = chunk.get("file_id")
             if not file_id:
-                logger.warning(f"Found chunk without file_id for participant {participant_id}, skipping.")
+                logger.warning("Found chunk without file_id for participant %s, skipping.", participant_id)
                 continue
 
             if file_id not in document_summaries:
@@ -361,13 +386,13 @@ async def list_participant_documents(participant_id: str, user_id: str) -> dict:
         # Convert the dictionary of summaries to a list
         summaries_list = list(document_summaries.values())
 
-        logger.info(f"Successfully retrieved summaries for {len(summaries_list)} documents for participant: {participant_id}")
+        logger.info("Successfully retrieved summaries for %s documents for participant: %s", len(summaries_list), participant_id)
         return {"documents": summaries_list}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error listing documents for participant {participant_id}: {str(e)}", exc_info=True)
+        logger.error("Error listing documents for participant %s: %s", participant_id, str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error while retrieving documents")
 
 
@@ -376,17 +401,17 @@ async def upload_participant_document(participant_id: str, user_id: str, file: U
     Uploads a document (.txt, .md), chunks it, generates embeddings,
     and stores chunks in the participant_docs container.
     """
-    logger.info(f"Uploading document '{file.filename}' for participant ID: {participant_id}, user ID: {user_id}")
+    logger.info("Uploading document '%s' for participant ID: %s, user ID: %s", file.filename, participant_id, user_id)
 
     supported_extensions = get_supported_extensions()
     file_extension = f".{file.filename.split('.')[-1].lower()}" if "." in file.filename else ""
     if file_extension not in supported_extensions:
-        logger.error(f"Unsupported file type: {file_extension} for file '{file.filename}'")
-        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}. Supported types: {', '.join(sorted(supported_extensions))}")
+        logger.error("Unsupported file type: %s for file '%s'", file_extension, file.filename)
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}. Supported types: {SUPPORTED_EXTENSIONS_DISPLAY}")
 
     participant = await cosmos_client.get_participant(user_id, participant_id)
     if not participant:
-        logger.error(f"Participant not found with ID: {participant_id}")
+        logger.error("Participant not found with ID: %s", participant_id)
         raise HTTPException(status_code=404, detail=f"Participant with ID '{participant_id}' not found")
 
     try:
@@ -403,76 +428,78 @@ async def upload_participant_document(participant_id: str, user_id: str, file: U
             logger.error("Blob storage upload failed to return complete document info.")
             raise HTTPException(status_code=500, detail="Failed to get complete info from blob storage upload.")
 
-        logger.info(f"File '{original_filename}' uploaded to blob storage at path: {blob_path}")
+        logger.info("File '%s' uploaded to blob storage at path: %s", original_filename, blob_path)
 
         # Use the utility function to read content, handles different types and decoding
         # The read_file_content function will raise HTTPException on failure
         await file.seek(0)
         text_content = await read_file_content(file)
-        logger.info(f"Successfully read content from '{original_filename}' using file reader utility.")
+        logger.info("Successfully read content from '%s' using file reader utility.", original_filename)
 
         chunks = chunk_text(text_content)
-        logger.info(f"Document '{original_filename}' split into {len(chunks)} chunks.")
+        logger.info("Document '%s' split into %s chunks.", original_filename, len(chunks))
 
         llm_client = await get_llm_client(user_id)
 
-        stored_chunk_ids = []
-        for i, chunk in enumerate(chunks):
+        try:
+            # Embedding calls use the sync SDK; run them in a worker thread so the upload doesn't block other requests
+            chunk_embeddings = await asyncio.to_thread(llm_client.generate_embeddings_batch, chunks)
+            logger.debug("Generated embeddings for %s chunks of file %s", len(chunks), file_id)
+        except Exception as emb_e:
+            logger.error("Failed to generate embeddings for file %s: %s", file_id, emb_e, exc_info=True)
+            try:
+                await blob_db.delete_file(user_id, participant_id, blob_path)
+            except Exception as cleanup_e:
+                logger.error("Failed to clean up blob file '%s' after embedding error: %s", blob_path, cleanup_e)
+            raise HTTPException(status_code=500, detail="Failed to generate embeddings for document chunks.")
+
+        doc_chunks = []
+        for i, (chunk, embeddings) in enumerate(zip(chunks, chunk_embeddings)):
             chunk_no = i + 1
             chunk_id = f"{user_id}::{participant_id}::{file_id}::{chunk_no}"
 
-            try:
-                embeddings = llm_client.generate_embeddings(chunk)
-                logger.debug(f"Generated embeddings for chunk {chunk_no}/{len(chunks)} of file {file_id}")
-            except Exception as emb_e:
-                logger.error(f"Failed to generate embeddings for chunk {chunk_no} of file {file_id}: {emb_e}", exc_info=True)
-                try:
-                    await blob_db.delete_file(user_id, participant_id, blob_path)
-                except Exception as cleanup_e:
-                    logger.error(f"Failed to clean up blob file '{blob_path}' after embedding error: {cleanup_e}")
-                raise HTTPException(status_code=500, detail=f"Failed to generate embeddings for chunk {chunk_no}.")
-
-            doc_chunk_data = {
-                "id": chunk_id,
-                "chunk_no": chunk_no,
-                "file_id": file_id,
-                "participant_id": participant_id,
-                "user_id": user_id,
-                "name": original_filename,
-                "clean_name": clean_filename,
-                "path": blob_path,
-                "size": file_size,
-                "type": file_type,
-                "text_chunk": chunk,
-                "embeddings": embeddings,
-            }
+            doc_chunks.append(
+                {
+                    "id": chunk_id,
+                    "chunk_no": chunk_no,
+                    "file_id": file_id,
+                    "participant_id": participant_id,
+                    "user_id": user_id,
+                    "name": original_filename,
+                    "clean_name": clean_filename,
+                    "path": blob_path,
+                    "size": file_size,
+                    "type": file_type,
+                    "text_chunk": chunk,
+                    "embeddings": embeddings,
+                }
+            )
 
+        # Store all chunks in transactional batches rather than one upsert round trip per chunk
+        try:
+            stored_chunk_ids = await cosmos_client.add_participant_doc_chunks(participant_id, doc_chunks)
+        except Exception as db_e:
+            logger.error("Failed to store chunks for file %s in Cosmos DB: %s", file_id, db_e, exc_info=True)
             try:
-                await cosmos_client.add_participant_doc_chunk(doc_chunk_data)
-                stored_chunk_ids.append(chunk_id)
-                logger.debug(f"Stored chunk {chunk_no}/{len(chunks)} with id {chunk_id}")
-            except Exception as db_e:
-                logger.error(f"Failed to store chunk {chunk_id} in Cosmos DB: {db_e}", exc_info=True)
-                try:
-                    await blob_db.delete_file(user_id, participant_id, blob_path)
-                except Exception as cleanup_e:
-                    logger.error(f"Failed to clean up blob file '{blob_path}' after DB store error: {cleanup_e}")
-                raise HTTPException(status_code=500, detail=f"Failed to store document chunk {chunk_no} in database.")
+                await blob_db.delete_file(user_id, participant_id, blob_path)
+            except Exception as cleanup_e:
+                logger.error("Failed to clean up blob file '%s' after DB store error: %s", blob_path, cleanup_e)
+            raise HTTPException(status_code=500, detail="Failed to store document chunks in database.")
 
-        logger.info(f"Successfully processed and stored {len(stored_chunk_ids)} chunks for document '{original_filename}' (file_id: {file_id})")
+        logger.info("Successfully processed and stored %s chunks for document '%s' (file_id: %s)", len(stored_chunk_ids), original_filename, file_id)
 
         return {**doc_info, "chunk_count": len(chunks), "stored_chunk_ids": stored_chunk_ids}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error uploading document for participant {participant_id}: {str(e)}", exc_info=True)
+        logger.error("Error uploading document for participant %s: %s", participant_id, str(e), exc_info=True)
         if "blob_path" in locals() and blob_path:
             try:
                 await blob_db.delete_file(user_id, participant_id, blob_path)
-                logger.info(f"Cleaned up blob file '{blob_path}' due to overall upload error.")
+                logger.info("Cleaned up blob file '%s' due to overall upload error.", blob_path)
             except Exception as cleanup_e:
-                logger.error(f"Failed to clean up blob file '{blob_path}' after overall upload error: {cleanup_e}")
+                logger.error("Failed to clean up blob file '%s' after overall upload error: %s", blob_path, cleanup_e)
         raise HTTPException(status_code=500, detail="Internal server error while uploading and processing document")
     finally:
         await file.close()
@@ -483,11 +510,11 @@ async def delete_participant_document(participant_id: str, user_id: str, file_id
     Deletes all chunks associated with a specific file_id for a participant
     from the participant_docs container and deletes the corresponding blob file.
     """
-    logger.info(f"Deleting document with file_id: {file_id} for participant ID: {participant_id}, user ID: {user_id}")
+    logger.info("Deleting document with file_id: %s for participant ID: %s, user ID: %s", file_id, participant_id, user_id)
 
     participant = await cosmos_client.get_participant(user_id, participant_id)
     if not participant:
-        logger.error(f"Participant not found with ID: {participant_id}")
+        logger.error("Participant not found with ID: %s", participant_id)
         raise HTTPException(status_code=404, detail=f"Participant with ID '{participant_id}' not found")
 
     try:
@@ -498,18 +525,18 @@ async def delete_participant_document(participant_id: str, user_id: str, file_id
         chunks_to_delete = list(doc_container.query_items(query=query, parameters=parameters, partition_key=participant_id))
 
         if not chunks_to_delete:
-            logger.error(f"Document with file_id '{file_id}' not found for participant {participant_id}")
+            logger.error("Document with file_id '%s' not found for participant %s", file_id, participant_id)
             raise HTTPException(status_code=404, detail=f"Document with file_id '{file_id}' not found for this participant.")
 
         blob_path_to_delete = chunks_to_delete[0].get("path")
         if blob_path_to_delete:
             try:
                 await blob_db.delete_file(user_id, participant_id, blob_path_to_delete)
-                logger.info(f"Deleted blob file: {blob_path_to_delete}")
+                logger.info("Deleted blob file: %s", blob_path_to_delete)
             except Exception as e:
-                logger.warning(f"Failed to delete blob file {blob_path_to_delete} for file_id {file_id}: {str(e)}")
+                logger.warning("Failed to delete blob file %s for file_id %s: %s", blob_path_to_delete, file_id, str(e))
         else:
-            logger.warning(f"No blob path found in chunks for file_id {file_id}, cannot delete from blob storage.")
+            logger.warning("No blob path found in chunks for file_id %s, cannot delete from blob storage.", file_id)
 
         deleted_chunk_count = 0
         for chunk in chunks_to_delete:
@@ -518,20 +545,20 @@ async def delete_participant_document(participant_id: str, user_id: str, file_id
                 try:
                     doc_container.delete_item(item=chunk_id, partition_key=participant_id)
                     deleted_chunk_count += 1
-                    logger.debug(f"Deleted chunk {chunk_id} for file_id {file_id}")
+                    logger.debug("Deleted chunk %s for file_id %s", chunk_id, file_id)
                 except Exception as e:
-                    logger.error(f"Failed to delete chunk {chunk_id} for file_id {file_id}: {str(e)}", exc_info=True)
+                    logger.error("Failed to delete chunk %s for file_id %s: %s", chunk_id, file_id, str(e), exc_info=True)
 
-        logger.info(f"Attempted deletion of {len(chunks_to_delete)} chunks for file_id {file_id}. Successfully deleted: {deleted_chunk_count}")
+        logger.info("Attempted deletion of %s chunks for file_id %s. Successfully deleted: %s", len(chunks_to_delete), file_id, deleted_chunk_count)
 
         if deleted_chunk_count != len(chunks_to_delete):
-            logger.error(f"Partial deletion: Only {deleted_chunk_count}/{len(chunks_to_delete)} chunks deleted for file_id {file_id}.")
+            logger.error("Partial deletion: Only %s/%s chunks deleted for file_id %s.", deleted_chunk_count, len(chunks_to_delete), file_id)
         return {"deleted_file_id": file_id, "deleted_chunk_count": deleted_chunk_count}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting document file_id {file_id} for participant {participant_id}: {str(e)}", exc_info=True)
+        logger.error("Error deleting document file_id %s for participant %s: %s", file_id, participant_id, str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error while deleting document")
 
 
@@ -553,25 +580,25 @@ async def search_participant_knowledge(user_id: str, participant_id: str, search
         HTTPException: If the participant is not found, or if there's an error
                        during embedding generation or database search.
     """
-    logger.info(f"Initiating knowledge search for participant '{participant_id}' with query: '{search_text[:50]}...'")
+    logger.info("Initiating knowledge search for participant '%s' with query: '%s...'", participant_id, search_text[:50])
 
     # 1. Check if participant exists
     participant = await cosmos_client.get_participant(user_id, participant_id)
     if not participant:
-        logger.error(f"Participant not found with ID: {participant_id} for user {user_id}")
+        logger.error("Participant not found with ID: %s for user %s", participant_id, user_id)
         raise HTTPException(status_code=404, detail=f"Participant with ID '{participant_id}' not found")
 
     try:
         # 2. Get LLM client and generate embeddings for the search text
         llm_client = await get_llm_client(user_id)
-        logger.debug(f"Generating embeddings for search text using LLM client for user {user_id}")
-        query_vector = llm_client.generate_embeddings(search_text)
-        logger.debug(f"Successfully generated query vector.")
+        logger.debug("Generating embeddings for search text using LLM client for user %s", user_id)
+        query_vector = await asyncio.to_thread(llm_client.generate_embeddings, search_text)
+        logger.debug("Successfully generated query vector.")
 
         # 3. Perform vector search using the cosmos_client method
-        logger.info(f"Performing vector search in Cosmos DB for participant {participant_id}, top_k={top_k}")
+        logger.info("Performing vector search in Cosmos DB for participant %s, top_k=%s", participant_id, top_k)
         search_results = await cosmos_client.vector_search_participant_docs(query_vector=query_vector, participant_id=participant_id, top_k=top_k)  # Filter by this participant
-        logger.info(f"Vector search completed, found {len(search_results)} results.")
+        logger.info("Vector search completed, found %s results.", len(search_results))
 
         return search_results
 
@@ -579,7 +606,7 @@ async def search_participant_knowledge(user_id: str, participant_id: str, search
         # Re-raise HTTPExceptions (e.g., from get_llm_client or vector_search)
         raise
     except Exception as e:
-        logger.error(f"Error during knowledge search for participant {participant_id}: {str(e)}", exc_info=True)
+        logger.error("Error during knowledge search for participant %s: %s", participant_id, str(e), exc_info=True)
         # Check if it's an embedding error or other
         if "generate_embeddings" in str(e):
             raise HTTPException(status_code=500, detail="Failed to generate embeddings for the search query.")
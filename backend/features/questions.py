@@ -1,44 +1,117 @@
+import asyncio
+import hashlib
+from typing import Any, Dict
 from pydantic import BaseModel
 from utils_llm import LLMClient
 from fastapi import HTTPException
 from logger_config import setup_logger
 from prompts import generate_questions_prompt
 from features.group import get_group
+from features.llm import get_llm_client
+from cache import cache_client, group_context_cache_key, questions_cache_key, GROUP_CONTEXT_CACHE_TTL
 
 # Set up logger
 logger = setup_logger(__name__)
 
+QUESTIONS_CACHE_TTL = 300  # seconds
+MIN_QUESTIONS = 5
+# Stricter than the LLM client's default, since short topics that differ by one word can still embed very closely
+QUESTIONS_SEMANTIC_THRESHOLD = 0.98
+
+# In-flight generations keyed by request hash, so concurrent identical requests share one LLM call
+_inflight_questions: Dict[str, asyncio.Future] = {}
+
 
 class QuestionResponse(BaseModel):
     questions: list[str]
 
 
 async def generate_questions(topic: str, group_id: str, user_id: str) -> QuestionResponse:
+    """Generate questions, sharing the result of identical in-flight or recently completed requests."""
+    request_key = hashlib.sha1(f"{topic}|{group_id}|{user_id}".encode()).hexdigest()
+    cache_key = questions_cache_key(user_id, request_key)
+
+    cached = await cache_client.get(cache_key)
+    if cached is not None:
+        logger.info("Serving cached questions for topic: %s, group: %s, user: %s", topic, group_id, user_id)
+        return QuestionResponse(**cached)
+
+    inflight = _inflight_questions.get(request_key)
+    if inflight is not None:
+        logger.info("Joining in-flight question generation for topic: %s, group: %s, user: %s", topic, group_id, user_id)
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_questions[request_key] = future
+    try:
+        result = await _generate_questions(topic, group_id, user_id)
+        future.set_result(result)
+        await cache_client.set(cache_key, result.model_dump(), QUESTIONS_CACHE_TTL)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark as retrieved so a failure with no waiters is not logged as unhandled
+        raise
+    finally:
+        _inflight_questions.pop(request_key, None)
+
+
+async def get_group_context(group_id: str, user_id: str) -> Dict[str, Any]:
+    """Get the parts of a group that question prompts use, cached since group membership rarely changes."""
+    cache_key = group_context_cache_key(user_id, group_id)
+    group_context = await cache_client.get(cache_key)
+    if group_context is not None:
+        return group_context
+
+    group = await get_group(group_id, user_id)
+    if not group:
+        raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
+
+    group_context = {"participants": [{"name": p["name"], "role": p["role"]} for p in group.get("participants", [])]}
+    if "context" in group:
+        group_context["context"] = group["context"]
+
+    await cache_client.set(cache_key, group_context, GROUP_CONTEXT_CACHE_TTL)
+    return group_context
+
+
+def _parse_questions(response: str) -> list[str]:
+    """Split an LLM response into its numbered questions."""
+    return [line.strip()[3:] for line in response.strip().split("\n") if line.strip()]
+
+
+async def _generate_questions(topic: str, group_id: str, user_id: str) -> QuestionResponse:
     """Generate questions based on topic and group context."""
     try:
         logger.info("Generating questions for topic: %s, group: %s, user: %s", topic, group_id, user_id)
 
-        # Fetch group details
-        group = await get_group(group_id, user_id)
-        if not group:
-            raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
+        # Fetch group context
+        group_context = await get_group_context(group_id, user_id)
 
         # Get LLM client with user's configuration
-        from features.chat import get_llm_client  # Import here to avoid circular import
-
         llm_client = await get_llm_client(user_id)
 
         # Get prompt from prompts.py
-        prompt = generate_questions_prompt(topic, group)
+        prompt = generate_questions_prompt(topic, group_context)
 
         # Generate questions using LLM
         messages = [{"role": "system", "content": prompt}]
-        response, _ = llm_client.send_request(messages)
+        # Reuse questions generated for a closely similar topic with this same group context, caching only usable responses
+        response, _ = await llm_client.asend_request(
+            messages,
+            semantic_cache=topic,
+            semantic_context=group_context,
+            semantic_threshold=QUESTIONS_SEMANTIC_THRESHOLD,
+            cache_if=lambda result: len(_parse_questions(result[0])) >= MIN_QUESTIONS,
+        )
 
         # Process response into list of questions
-        questions = [line.strip()[3:] for line in response.strip().split("\n") if line.strip()]
+        questions = _parse_questions(response)
 
-        if len(questions) < 5:
+        if len(questions) < MIN_QUESTIONS:
             logger.error("Not enough questions generated: %d", len(questions))
             raise HTTPException(status_code=500, detail="Failed to generate sufficient questions")
 
@@ -49,4 +122,4 @@ async def generate_questions(topic: str, group_id: str, user_id: str) -> Questio
         raise
     except Exception as e:
         logger.error("Failed to generate questions: %s", str(e), exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate questions")
@@ -11,6 +11,7 @@ import requests
 import json
 from cosmos_db import cosmos_client
 import copy
+import asyncio
 
 # Set up logger
 logger = setup_logger(__name__)
@@ -119,13 +120,13 @@ async def login_user(name: str, email: str) -> Dict:
             logger.warning("Token missing email claim")
             raise HTTPException(status_code=400, detail="Email claim not found in token")
 
-        logger.info(f"User authenticated: {email}")
+        logger.info("User authenticated: %s", email)
 
         # Check if user exists in Cosmos DB
         user_data = await cosmos_client.get_user_data(email)
 
         if not user_data:
-            logger.info(f"Creating new user account for: {email}")
+            logger.info("Creating new user account for: %s", email)
 
             # Fetch admin template for new user creation
             admin_template = await cosmos_client.get_user_data("roundtable_ai_admin")
@@ -152,8 +153,9 @@ async def login_user(name: str, email: str) -> Dict:
             new_user["_ts"] = None
 
             # Create new user in Cosmos DB using upsert_item with the full new_user object
-            created_user = cosmos_client.container.upsert_item(body=new_user)  # Use upsert_item directly
-            logger.info(f"New user created: {email}")
+            # The Cosmos SDK call is blocking, so run it in a worker thread to keep the event loop serving other requests
+            created_user = await asyncio.to_thread(cosmos_client.container.upsert_item, body=new_user)  # Use upsert_item directly
+            logger.info("New user created: %s", email)
             # Add 'name' field mapped from 'display_name' and return the full created user data
             created_user["name"] = created_user.get("display_name")
             return created_user
@@ -166,7 +168,7 @@ async def login_user(name: str, email: str) -> Dict:
                         if isinstance(provider, dict) and "api_key" in provider:
                             provider["api_key"] = "SECRET"
 
-        logger.info(f"Existing user logged in: {email}")
+        logger.info("Existing user logged in: %s", email)
         # Add 'name' field mapped from 'display_name' and return the full existing user data
         user_data["name"] = user_data.get("display_name")
         return user_data
@@ -208,25 +210,23 @@ async def get_me_detail(user_id: str) -> Dict:
     try:
         logger.info("Fetching detailed user information for user: %s", user_id)
 
-        # Get user data from Cosmos DB
-        user_data = await cosmos_client.get_user_data(user_id)
-        if not user_data:
+        # Counts are computed by Cosmos DB, so the embedded collections are never transferred
+        summary = await cosmos_client.get_user_summary(user_id)
+        if not summary:
             logger.error("User not found with ID: %s", user_id)
             raise HTTPException(status_code=404, detail=f"User with ID '{user_id}' not found")
 
-        # Extract basic user information
-        # Map fields for response, matching UserDetailResponse
+        # Map fields for response, matching UserDetailResponse.
+        # ARRAY_LENGTH omits the field when the collection is missing, so default counts to 0
         response = {
-            "id": user_data.get("id"),
-            "name": user_data.get("display_name", ""),  # Map display_name to name
-            "email": user_data.get("email", ""),
-            # Include other fields expected by UserDetailResponse (or add them to the model)
-            # For now, just mapping the base fields and counts
-            "llm_providers_count": len(user_data.get("llmAccounts", {}).get("providers", [])),
-            "participants_count": len(user_data.get("participants", [])),
-            "meetings_count": len(user_data.get("meetings", [])),
-            "groups_count": len(user_data.get("groups", [])),
-            "chat_sessions_count": len(user_data.get("chat_sessions", [])),  # Assuming this might be needed later
+            "id": summary.get("user_id"),
+            "name": summary.get("display_name", ""),
+            "email": summary.get("email", ""),
+            "llm_providers_count": summary.get("llm_providers_count", 0),
+            "participants_count": summary.get("participants_count", 0),
+            "meetings_count": summary.get("meetings_count", 0),
+            "groups_count": summary.get("groups_count", 0),
+            "chat_sessions_count": summary.get("chat_sessions_count", 0),
         }
 
         logger.info("Successfully retrieved detailed user information for: %s", user_id)
@@ -0,0 +1,40 @@
+"""
+LLM provider clients.
+
+Provider classes are resolved on first attribute access, so importing this
+package does not pull in any vendor SDK until a client is actually used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+__all__ = ["AzureOpenAIClient", "OpenAIClient", "GrokClient", "DeepseekClient", "GeminiClient"]
+
+# Client class name -> submodule that defines it
+_SUBMODULES = {
+    "AzureOpenAIClient": "azure_openai",
+    "OpenAIClient": "openai_client",
+    "GrokClient": "grok_client",
+    "DeepseekClient": "deepseek_client",
+    "GeminiClient": "gemini_client",
+}
+
+if TYPE_CHECKING:
+    from .azure_openai import AzureOpenAIClient
+    from .deepseek_client import DeepseekClient
+    from .gemini_client import GeminiClient
+    from .grok_client import GrokClient
+    from .openai_client import OpenAIClient
+
+
+def __getattr__(name):
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
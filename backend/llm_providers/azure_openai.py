@@ -1,8 +1,10 @@
-from openai import AzureOpenAI
-from .base import LLMBase, logger
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
+from .base import LLMBase, logger, get_openai_http_client, get_openai_async_http_client
 import time
 
+# Inputs sent per embeddings request; one call embeds a whole batch of document chunks
+EMBEDDING_BATCH_SIZE = 100
+
 
 class AzureOpenAIClient(LLMBase):
     def __init__(self, api_key, azure_endpoint, **kwargs):
@@ -11,13 +13,14 @@ class AzureOpenAIClient(LLMBase):
 
         try:
             # TODO: Make api_version configurable
-            self.client = AzureOpenAI(api_key=api_key, api_version="2024-10-21", azure_endpoint=azure_endpoint)
+            self.client = AzureOpenAI(api_key=api_key, api_version="2024-10-21", azure_endpoint=azure_endpoint, http_client=get_openai_http_client())
+            self.aclient = AsyncAzureOpenAI(api_key=api_key, api_version="2024-10-21", azure_endpoint=azure_endpoint, http_client=get_openai_async_http_client())
             logger.info("Successfully initialized Azure OpenAI client with endpoint: %s", azure_endpoint)
         except Exception as e:
             logger.error("Failed to initialize Azure OpenAI client: %s", str(e), exc_info=True)
             raise
 
-    def send_request(self, prompt_or_messages, **kwargs):
+    def _build_parameters(self, prompt_or_messages, **kwargs):
         if isinstance(prompt_or_messages, str):
             messages = [{"role": "user", "content": prompt_or_messages}]
         elif isinstance(prompt_or_messages, list):
@@ -27,32 +30,60 @@ class AzureOpenAIClient(LLMBase):
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        try:
-            parameters = {
-                "model": kwargs.get("model", self.model),
-                "temperature": kwargs.get("temperature", 0.5),
-                "top_p": kwargs.get("top_p", 0.5),
-                "max_tokens": kwargs.get("max_tokens", 10000),  # TODO: Check if this max_tokens is appropriate or should be configurable
-                "messages": messages,
-            }
-            logger.debug("Sending request to Azure OpenAI with parameters: %s", parameters)
+        parameters = {
+            "model": kwargs.get("model", self.model),
+            "temperature": kwargs.get("temperature", 0.5),
+            "top_p": kwargs.get("top_p", 0.5),
+            "max_tokens": kwargs.get("max_tokens", 10000),  # TODO: Check if this max_tokens is appropriate or should be configurable
+            "messages": messages,
+        }
+        logger.debug("Sending request to Azure OpenAI with parameters: %s", parameters)
+        return parameters
 
-            completion = self.client.chat.completions.create(**parameters)
-            request_tokens = completion.usage.prompt_tokens
-            completion_tokens = completion.usage.completion_tokens
-            total_tokens = completion.usage.total_tokens
+    @staticmethod
+    def _parse_completion(completion):
+        request_tokens = completion.usage.prompt_tokens
+        completion_tokens = completion.usage.completion_tokens
+        total_tokens = completion.usage.total_tokens
+
+        logger.info("Request successful - Tokens used: %d (prompt: %d, completion: %d)", total_tokens, request_tokens, completion_tokens)
 
-            logger.info("Request successful - Tokens used: %d (prompt: %d, completion: %d)", total_tokens, request_tokens, completion_tokens)
+        return completion.choices[0].message.content.strip(), {
+            "request_tokens": request_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        }
 
-            return completion.choices[0].message.content.strip(), {
-                "request_tokens": request_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": total_tokens,
-            }
+    def send_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
+        try:
+            completion = self.client.chat.completions.create(**parameters)
+            return self._parse_completion(completion)
         except Exception as e:
             logger.error("Failed to send request to Azure OpenAI: %s", str(e), exc_info=True)
             raise
 
+    async def asend_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
+        try:
+            completion = await self.aclient.chat.completions.create(**parameters)
+            return self._parse_completion(completion)
+        except Exception as e:
+            logger.error("Failed to send request to Azure OpenAI: %s", str(e), exc_info=True)
+            raise
+
+    async def astream_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
+        try:
+            stream = await self.aclient.chat.completions.create(stream=True, **parameters)
+            async for chunk in stream:
+                # Azure sends chunks without choices (e.g. prompt filter results) before the content
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error("Failed to stream request from Azure OpenAI: %s", str(e), exc_info=True)
+            raise
+
     def send_request_w_structured_response(self, prompt_or_messages, response_format, **kwargs):
         if isinstance(prompt_or_messages, str):
             messages = [{"role": "user", "content": prompt_or_messages}]
@@ -84,3 +115,10 @@ class AzureOpenAIClient(LLMBase):
         response = self.client.embeddings.create(input=text, model="text-embedding-ada-002")
         embeddings = response.data[0].embedding
         return embeddings
+
+    def generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        embeddings = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = self.client.embeddings.create(input=texts[start : start + EMBEDDING_BATCH_SIZE], model="text-embedding-ada-002")
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
@@ -1,12 +1,77 @@
 import os
+import asyncio
 import datetime
+import threading
+import time
 import json
 from abc import ABC, abstractmethod
+import requests
+from requests.adapters import HTTPAdapter
 from logger_config import setup_logger
 
 # Set up logger
 logger = setup_logger(__name__)
 
+# Shared session for providers that call their REST API directly. Keeping one pool per process
+# lets requests reuse open connections and TLS sessions instead of handshaking on every call.
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Shared httpx client for the OpenAI SDK clients, so OpenAI and Azure OpenAI clients for different
+# accounts share one connection pool. Created on first use to keep the SDK import lazy.
+_openai_http_client = None
+_openai_http_client_lock = threading.Lock()
+
+# Idle pooled connections are kept this long. The SDK default of 5 seconds closes them between
+# most chat turns, so the next LLM call pays for a new TCP and TLS handshake.
+OPENAI_KEEPALIVE_EXPIRY = 60.0  # seconds
+
+
+def _openai_connection_limits():
+    """The SDK's default connection limits with a longer keep-alive, built from the SDK's own Limits type."""
+    from openai import DEFAULT_CONNECTION_LIMITS
+
+    return type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=DEFAULT_CONNECTION_LIMITS.max_connections,
+        max_keepalive_connections=DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_openai_http_client():
+    """Return the process-wide httpx client passed to OpenAI and AzureOpenAI as http_client."""
+    global _openai_http_client
+    if _openai_http_client is None:
+        with _openai_http_client_lock:
+            if _openai_http_client is None:
+                from openai import DefaultHttpxClient
+
+                _openai_http_client = DefaultHttpxClient(limits=_openai_connection_limits())
+    return _openai_http_client
+
+
+_openai_async_http_client = None
+
+
+def get_openai_async_http_client():
+    """Return the process-wide async httpx client passed to AsyncOpenAI and AsyncAzureOpenAI as http_client."""
+    global _openai_async_http_client
+    if _openai_async_http_client is None:
+        with _openai_http_client_lock:
+            if _openai_async_http_client is None:
+                from openai import DefaultAsyncHttpxClient
+
+                _openai_async_http_client = DefaultAsyncHttpxClient(limits=_openai_connection_limits())
+    return _openai_async_http_client
+
+
+# (second, (date, time)) of the last formatted timestamp; _get_timestamp only has second resolution
+_timestamp_cache = (None, None)
+
+# Directories already created or verified by _ensure_directory_exists, so repeat calls skip the makedirs syscalls
+_verified_directories = set()
+_verified_directories_lock = threading.Lock()
+
 
 class LLMBase(ABC):
     def __init__(self, api_key=None, model="default-model", **kwargs):
@@ -22,25 +87,57 @@ class LLMBase(ABC):
     def send_request_w_structured_response(self, prompt_or_messages, response_format, **kwargs):
         pass
 
+    async def asend_request(self, prompt_or_messages, **kwargs):
+        """
+        Async send_request. Providers with an async SDK override this; the default runs
+        send_request in a worker thread so it never blocks the event loop.
+        """
+        return await asyncio.to_thread(self.send_request, prompt_or_messages, **kwargs)
+
+    async def astream_request(self, prompt_or_messages, **kwargs):
+        """
+        Async generator yielding the response text in chunks as the model produces it. Providers with a
+        streaming API override this; the default yields the whole asend_request response as one chunk.
+        """
+        response, _ = await self.asend_request(prompt_or_messages, **kwargs)
+        yield response
+
     @abstractmethod
     def generate_embeddings(self, text: str) -> list[float]:
         pass
 
+    def generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generates embeddings for several texts, in input order.
+        Providers whose API accepts multiple inputs per call override this to avoid a round trip per text.
+        """
+        return [self.generate_embeddings(text) for text in texts]
+
     @staticmethod
     def _get_timestamp():
         """
-        Returns the current date and time.
+        Returns the current date and time. Formatting is reused for calls within the same second.
         """
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d"), now.strftime("%H-%M-%S")
+        global _timestamp_cache
+        second = int(time.time())
+        cached_second, timestamp = _timestamp_cache
+        if second != cached_second:
+            now = datetime.datetime.fromtimestamp(second)
+            timestamp = (now.strftime("%Y-%m-%d"), now.strftime("%H-%M-%S"))
+            _timestamp_cache = (second, timestamp)
+        return timestamp
 
     @staticmethod
     def _ensure_directory_exists(directory):
         """
-        Ensures that the specified directory exists.
+        Ensures that the specified directory exists. Each directory is only checked on disk once per process.
         """
+        if directory in _verified_directories:
+            return
         try:
             os.makedirs(directory, exist_ok=True)
+            with _verified_directories_lock:
+                _verified_directories.add(directory)
             logger.debug("Created/verified directory: %s", directory)
         except Exception as e:
             logger.error("Failed to create directory %s: %s", directory, str(e), exc_info=True)
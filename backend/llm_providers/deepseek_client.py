@@ -1,6 +1,6 @@
 import requests
 import json
-from .base import LLMBase, logger
+from .base import LLMBase, logger, http_session
 
 
 class DeepseekClient(LLMBase):
@@ -32,7 +32,7 @@ class DeepseekClient(LLMBase):
         logger.debug("Sending request to Deepseek API with payload: %s", payload)
 
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
+            response = http_session.post(self.api_url, headers=self.headers, json=payload)
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
             completion = response.json()
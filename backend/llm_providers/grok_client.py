@@ -1,6 +1,6 @@
 import requests
 import os
-from .base import LLMBase, logger
+from .base import LLMBase, logger, http_session
 
 
 class GrokClient(LLMBase):
@@ -39,7 +39,7 @@ class GrokClient(LLMBase):
         logger.debug("Sending request to Grok API endpoint: %s with payload: %s", endpoint, payload)
 
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_session.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
             completion = response.json()
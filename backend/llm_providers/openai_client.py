@@ -1,5 +1,5 @@
-from openai import OpenAI
-from .base import LLMBase, logger
+from openai import OpenAI, AsyncOpenAI
+from .base import LLMBase, logger, get_openai_http_client, get_openai_async_http_client
 
 
 class OpenAIClient(LLMBase):
@@ -7,13 +7,14 @@ class OpenAIClient(LLMBase):
         super().__init__(api_key=api_key, **kwargs)
         try:
             # Assumes OPENAI_API_KEY environment variable is set if api_key is None
-            self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(api_key=api_key, http_client=get_openai_http_client())
+            self.aclient = AsyncOpenAI(api_key=api_key, http_client=get_openai_async_http_client())
             logger.info("Successfully initialized OpenAI client")
         except Exception as e:
             logger.error("Failed to initialize OpenAI client: %s", str(e), exc_info=True)
             raise
 
-    def send_request(self, prompt_or_messages, **kwargs):
+    def _build_parameters(self, prompt_or_messages, **kwargs):
         if isinstance(prompt_or_messages, str):
             messages = [{"role": "user", "content": prompt_or_messages}]
         elif isinstance(prompt_or_messages, list):
@@ -23,22 +24,58 @@ class OpenAIClient(LLMBase):
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+        logger.debug("Sending request to OpenAI")
+        return {
+            "model": kwargs.get("model", self.model),
+            "messages": messages,
+            "temperature": kwargs.get("temperature", 0.5),
+            "max_tokens": kwargs.get("max_tokens", 10000),  # TODO: Check if this max_tokens is appropriate or should be configurable
+            "top_p": kwargs.get("top_p", 0.5),
+        }
+
+    @staticmethod
+    def _parse_completion(completion):
+        request_tokens = completion.usage.prompt_tokens
+        completion_tokens = completion.usage.completion_tokens
+        total_tokens = completion.usage.total_tokens
+
+        logger.info("Request successful - Tokens used: %d (prompt: %d, completion: %d)", total_tokens, request_tokens, completion_tokens)
+
+        return completion.choices[0].message.content.strip(), {
+            "request_tokens": request_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        }
+
+    def send_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
         try:
-            logger.debug("Sending request to OpenAI")
-            response = self.client.chat.completions.create(
-                model=kwargs.get("model", self.model),
-                messages=messages,
-                temperature=kwargs.get("temperature", 0.5),
-                max_tokens=kwargs.get("max_tokens", 10000),  # TODO: Check if this max_tokens is appropriate or should be configurable
-                top_p=kwargs.get("top_p", 0.5),
-            )
-            logger.info("Successfully received response from OpenAI")
-
-            return response.choices[0].message.content.strip()
+            completion = self.client.chat.completions.create(**parameters)
+            return self._parse_completion(completion)
         except Exception as e:
             logger.error("Failed to send request to OpenAI: %s", str(e), exc_info=True)
             raise
 
+    async def asend_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
+        try:
+            completion = await self.aclient.chat.completions.create(**parameters)
+            return self._parse_completion(completion)
+        except Exception as e:
+            logger.error("Failed to send request to OpenAI: %s", str(e), exc_info=True)
+            raise
+
+    async def astream_request(self, prompt_or_messages, **kwargs):
+        parameters = self._build_parameters(prompt_or_messages, **kwargs)
+        try:
+            stream = await self.aclient.chat.completions.create(stream=True, **parameters)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error("Failed to stream request from OpenAI: %s", str(e), exc_info=True)
+            raise
+
     def send_request_w_structured_response(self, prompt_or_messages, response_format, **kwargs):
         # TODO: Implement structured response logic for standard OpenAI if needed/supported
         error_msg = "OpenAI structured response logic not implemented"
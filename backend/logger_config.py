@@ -1,5 +1,8 @@
+import atexit
 import logging
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from typing import Optional
 from colorama import init, Fore, Style
 
@@ -20,6 +23,29 @@ class ColoredFormatter(logging.Formatter):
         return f"{color}{message}{Style.RESET_ALL}"
 
 
+# All loggers enqueue records here; a background listener thread does the console I/O,
+# so logging from async handlers never blocks the event loop on a write
+_log_queue: SimpleQueue = SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+
+def _start_log_listener() -> None:
+    """Start the background listener that writes queued records to stdout (once per process)."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    # Create console handler with colored formatter
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(ColoredFormatter("[%(asctime)s] %(levelname)s [%(name)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+
+    _log_listener = QueueListener(_log_queue, console_handler, respect_handler_level=True)
+    _log_listener.start()
+
+    # Flush anything still queued on interpreter shutdown
+    atexit.register(_log_listener.stop)
+
+
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
     Set up a logger with consistent configuration and colored output.
@@ -36,17 +62,10 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
 
     # Only add handler if the logger doesn't already have handlers
     if not logger.handlers:
-        # Create console handler
-        handler = logging.StreamHandler(sys.stdout)
-
-        # Create colored formatter
-        formatter = ColoredFormatter("[%(asctime)s] %(levelname)s [%(name)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-
-        # Add formatter to handler
-        handler.setFormatter(formatter)
+        _start_log_listener()
 
-        # Add handler to logger
-        logger.addHandler(handler)
+        # Hand records to the background listener instead of writing inline
+        logger.addHandler(QueueHandler(_log_queue))
 
     # Set level (default to INFO if not specified)
     logger.setLevel(level or logging.INFO)
@@ -1,7 +1,8 @@
 import os
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -10,6 +11,7 @@ from logger_config import setup_logger
 
 # Import Routers
 from routers import participant, group, meeting, chat, chat_session, llm, questions, user
+from llm_providers.base import get_openai_http_client, get_openai_async_http_client
 
 # Set up logger
 logger = setup_logger(__name__)
@@ -17,8 +19,33 @@ logger = setup_logger(__name__)
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prewarm the shared LLM HTTP clients on startup and close them on shutdown."""
+    # Building them here moves the OpenAI SDK import and connection pool setup off the first LLM request
+    try:
+        get_openai_http_client()
+        get_openai_async_http_client()
+        logger.info("Prewarmed shared LLM HTTP clients")
+    except Exception as e:
+        logger.warning("Failed to prewarm LLM HTTP clients, they will be created on first use: %s", str(e))
+    yield
+    try:
+        await get_openai_async_http_client().aclose()
+        get_openai_http_client().close()
+    except Exception as e:
+        logger.warning("Failed to close LLM HTTP clients: %s", str(e))
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Roundtable AI Backend", description="API for managing AI agent discussions, participants, groups, and meetings.", version="0.1.0")
+app = FastAPI(
+    title="Roundtable AI Backend",
+    description="API for managing AI agent discussions, participants, groups, and meetings.",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,25 +56,20 @@ app.add_middleware(
 )
 
 
-# --- Custom Exception Handler for CORS ---
+# --- Custom Exception Handlers for CORS ---
 # This ensures that even errors raised before the response is processed
 # (like in authentication dependencies) still get CORS headers.
-@app.exception_handler(HTTPException)
-async def cors_aware_exception_handler(request: Request, exc: HTTPException):
-    # Get the origin from the request headers
-    origin = request.headers.get("origin")
+# Define allowed origins (should match CORSMiddleware config)
+ALLOWED_ORIGINS = {"http://localhost:5173", "https://wa-roundtableai-frontend-cefzgxbba8c4aqga.australiaeast-01.azurewebsites.net"}
 
-    # Define allowed origins (should match CORSMiddleware config)
-    allowed_origins = {"http://localhost:5173", "https://wa-roundtableai-frontend-cefzgxbba8c4aqga.australiaeast-01.azurewebsites.net"}
 
-    # Default response without CORS headers
-    response = JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail},
-    )
+def add_cors_headers(request: Request, response: ORJSONResponse) -> ORJSONResponse:
+    """Add CORS headers to an error response if the request origin is allowed."""
+    # Get the origin from the request headers
+    origin = request.headers.get("origin")
 
     # If the origin is allowed, add CORS headers to the error response
-    if origin in allowed_origins:
+    if origin in ALLOWED_ORIGINS:
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Credentials"] = "true"
         # You might want to be more specific with methods/headers if needed
@@ -57,6 +79,26 @@ async def cors_aware_exception_handler(request: Request, exc: HTTPException):
     return response
 
 
+@app.exception_handler(HTTPException)
+async def cors_aware_exception_handler(request: Request, exc: HTTPException):
+    response = ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+    )
+    return add_cors_headers(request, response)
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    # Single place where unexpected endpoint errors are logged, so routers don't need their own try/except
+    logger.error("Unhandled error on %s %s: %s", request.method, request.url.path, str(exc), exc_info=exc)
+    response = ORJSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"},
+    )
+    return add_cors_headers(request, response)
+
+
 # --- Include Routers ---
 # Entity Routers
 app.include_router(participant.router)
@@ -88,10 +130,14 @@ if __name__ == "__main__":
     try:
         port = int(os.getenv("PORT", "8000"))
         host = os.getenv("HOST", "0.0.0.0")  # Default to 0.0.0.0 to be accessible externally
-        logger.info("Starting FastAPI server on %s:%d", host, port)
+        # Worker processes, e.g. the CPU count in production. In-memory caches and rate limits are per worker, so set REDIS_URL when running more than one
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        logger.info("Starting FastAPI server on %s:%d with %d worker(s)", host, port, workers)
         # Consider adding reload=True for development environments
         # uvicorn.run("main:app", host=host, port=port, reload=True)
-        uvicorn.run(app, host=host, port=port)
+        # loop/http "auto" select uvloop and httptools when installed (see requirements.txt), falling back to asyncio/h11
+        # Multiple workers need the app as an import string so each process can import it
+        uvicorn.run("main:app" if workers > 1 else app, host=host, port=port, loop="auto", http="auto", workers=workers)
     except Exception as e:
         logger.critical("Failed to start FastAPI server: %s", str(e), exc_info=True)
         raise  # Re-raise the exception to ensure the failure is visible
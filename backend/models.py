@@ -44,6 +44,7 @@ class ListParticipantsResponse(BaseModel):
     """Response model for listing multiple participants."""
 
     participants: List[ParticipantResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page; None on the last page
 
 
 # --- Group Response Models ---
@@ -77,7 +78,7 @@ class MeetingResponse(BaseModel):
     group_id: str
     topic: Optional[str] = None
     status: str  # e.g., "scheduled", "in_progress", "completed"
-    created_at: str  # Consider using datetime for better type handling if possible
+    created_at: Optional[int] = None  # Epoch seconds; clients convert to local time
     user_id: str  # ID of the user who owns/created the meeting
 
 
@@ -100,12 +101,11 @@ class UserProfileResponse(BaseModel):
 class UserDetailResponse(UserProfileResponse):
     """Response model for detailed user information."""
 
-    # Inherits from UserProfileResponse
-    # Add additional fields returned by get_me_detail, e.g.:
-    # llm_accounts: List[LLMAccountResponse] = [] # Example
-    # groups: List[GroupResponse] = [] # Example
-    # meetings: List[MeetingResponse] = [] # Example
-    pass  # Add specific detailed fields here based on get_me_detail's return value
+    llm_providers_count: int = 0
+    participants_count: int = 0
+    meetings_count: int = 0
+    groups_count: int = 0
+    chat_sessions_count: int = 0
 
 
 # --- LLM Account Response Models ---
@@ -0,0 +1,35 @@
+import os
+import time
+from fastapi import Depends, HTTPException
+from auth import get_user_id
+from cache import cache_client
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger(__name__)
+
+RATE_LIMIT_WINDOW = 60  # seconds
+
+# Without Redis each worker process keeps its own counters, so the effective limit is multiplied by the worker count
+if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and cache_client.redis is None:
+    logger.warning("Rate limits are counted per worker because REDIS_URL is not set. Set REDIS_URL to enforce them across workers.")
+
+
+def rate_limit(name: str, limit: int, window: int = RATE_LIMIT_WINDOW):
+    """
+    Create a dependency that allows each user at most `limit` calls to an endpoint per fixed window.
+
+    The check runs before the endpoint body, so rejected requests never reach the database or LLM.
+    If the counter store is unavailable the request is allowed through. Counters are only shared across
+    workers when REDIS_URL is set.
+    """
+
+    async def check_rate_limit(user_id: str = Depends(get_user_id)) -> None:
+        window_start = int(time.time() // window)
+        count = await cache_client.incr(f"rl:{name}:{user_id}:{window_start}", window + 30)
+        if count is not None and count > limit:
+            logger.warning("Rate limit exceeded for user %s on %s (%d/%d per %ds)", user_id, name, count, limit, window)
+            retry_after = window - int(time.time()) % window
+            raise HTTPException(status_code=429, detail="Too many requests. Please try again later.", headers={"Retry-After": str(retry_after)})
+
+    return check_rate_limit
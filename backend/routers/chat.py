@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from logger_config import setup_logger
 from typing import Annotated, Optional  # Import Annotated and Optional
 
@@ -8,16 +8,17 @@ from features.chat import stream_meeting_discussion, MeetingDiscussion
 from features.chat_session import ChatSessionCreate
 
 # Import the new validation function and UserClaims
-from auth import UserClaims, validate_token, validate_token_from_string
+from auth import UserClaims, validate_token_from_string, get_user_id, normalize_user_id
 
 logger = setup_logger(__name__)
 
-router = APIRouter(tags=["Chat"])
+router = APIRouter(tags=["Chat"], default_response_class=ORJSONResponse)
 
 
 @router.get("/chat-stream", summary="Start streaming chat discussion for a meeting")
 # Add token as a query parameter dependency
 async def chat_stream_endpoint(meeting_id: str, token: Annotated[Optional[str], Query()] = None):
+    user_id = "Unknown"  # Bound before validation so the error path can always log it
     try:
         if not token:
             logger.warning("Chat stream request failed: No token provided for Meeting %s", meeting_id)
@@ -25,7 +26,7 @@ async def chat_stream_endpoint(meeting_id: str, token: Annotated[Optional[str],
 
         # Validate the token from the query parameter
         current_user: UserClaims = validate_token_from_string(token)
-        user_id = current_user.email  # Get user_id from validated token
+        user_id = normalize_user_id(current_user.email)  # Get user_id from validated token
 
         logger.info("User '%s' requesting chat stream for Meeting: %s", user_id, meeting_id)
 
@@ -45,9 +46,8 @@ async def chat_stream_endpoint(meeting_id: str, token: Annotated[Optional[str],
 
 
 @router.post("/chat-session", summary="Process a chat request within a meeting")
-async def chat_request_endpoint(chat_request: ChatSessionCreate, current_user: UserClaims = Depends(validate_token)):
+async def chat_request_endpoint(chat_request: ChatSessionCreate, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         meeting_id = chat_request.meeting_id
         logger.info("User '%s' processing chat request for Meeting: %s", user_id, meeting_id)
 
@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List
 from logger_config import setup_logger
 from features.chat_session import get_user_chat_sessions, get_chat_session_by_id, delete_chat_session
 from models import DeleteResponse
-from auth import UserClaims, validate_token
+from auth import get_user_id
 
 logger = setup_logger(__name__)
 
-router = APIRouter(prefix="/chat-session", tags=["Chat Sessions"])
+router = APIRouter(prefix="/chat-session", tags=["Chat Sessions"], default_response_class=ORJSONResponse)
 
 
 @router.get("s", summary="List all chat sessions for the authenticated user")
-async def list_chat_sessions_endpoint(current_user: UserClaims = Depends(validate_token)):
+async def list_chat_sessions_endpoint(user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("Fetching chat sessions for user: %s", user_id)
         sessions_list = await get_user_chat_sessions(user_id)
         logger.info("Successfully retrieved %d chat sessions for user: %s", len(sessions_list), user_id)
@@ -24,9 +24,8 @@ async def list_chat_sessions_endpoint(current_user: UserClaims = Depends(validat
 
 
 @router.get("/{session_id}", summary="Get a specific chat session")
-async def get_chat_session_endpoint(session_id: str, current_user: UserClaims = Depends(validate_token)):
+async def get_chat_session_endpoint(session_id: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("Fetching chat session: %s for user: %s", session_id, user_id)
         session = await get_chat_session_by_id(session_id, user_id)
         if session is None:
@@ -42,9 +41,8 @@ async def get_chat_session_endpoint(session_id: str, current_user: UserClaims =
 
 
 @router.delete("/{session_id}", response_model=DeleteResponse, summary="Delete a chat session")
-async def delete_chat_session_endpoint(session_id: str, current_user: UserClaims = Depends(validate_token)):
+async def delete_chat_session_endpoint(session_id: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to delete chat session: %s", user_id, session_id)
         result = await delete_chat_session(session_id, user_id)
         logger.info("Successfully deleted chat session: %s by user %s", session_id, user_id)
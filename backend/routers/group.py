@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List
 from logger_config import setup_logger
 
@@ -6,21 +7,21 @@ from features.group import create_group, get_group, update_group, delete_group,
 
 from models import GroupResponse, ListGroupsResponse, DeleteResponse
 
-from auth import UserClaims, validate_token
+from auth import get_user_id
+from cache import invalidate_group_context_cache
 
 logger = setup_logger(__name__)
 
-router = APIRouter(prefix="/group", tags=["Groups"])
+router = APIRouter(prefix="/group", tags=["Groups"], default_response_class=ORJSONResponse)
 
 
 @router.post("", response_model=GroupResponse, status_code=201, summary="Create a new group")
-async def create_group_endpoint(group: GroupCreate, current_user: UserClaims = Depends(validate_token)):
+async def create_group_endpoint(group: GroupCreate, user_id: str = Depends(get_user_id)):
     """
     Creates a new group associated with the authenticated user.
     Requires group details in the request body and a valid authentication token.
     """
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to create new group: %s", user_id, group.name)
         group.user_id = user_id
         created_group = await create_group(group)
@@ -32,13 +33,12 @@ async def create_group_endpoint(group: GroupCreate, current_user: UserClaims = D
 
 
 @router.get("s", response_model=ListGroupsResponse, summary="List all groups for the authenticated user")
-async def list_groups_endpoint(current_user: UserClaims = Depends(validate_token)):
+async def list_groups_endpoint(user_id: str = Depends(get_user_id)):
     """
     Retrieves a list of groups associated with the authenticated user.
     Requires a valid authentication token.
     """
     try:
-        user_id = current_user.email
         logger.info("Fetching all groups for user: %s", user_id)
         result = await list_groups(user_id)
         logger.info("Successfully retrieved %d groups for user: %s", len(result.get("groups", [])), user_id)
@@ -49,13 +49,12 @@ async def list_groups_endpoint(current_user: UserClaims = Depends(validate_token
 
 
 @router.get("/{group_id}", response_model=GroupResponse, summary="Get a specific group")
-async def get_group_endpoint(group_id: str, current_user: UserClaims = Depends(validate_token)):
+async def get_group_endpoint(group_id: str, user_id: str = Depends(get_user_id)):
     """
     Retrieves details for a specific group by its ID, ensuring it belongs to the authenticated user.
     Requires `group_id` in the path and a valid authentication token.
     """
     try:
-        user_id = current_user.email
         logger.info("Fetching group_id: %s for user: %s", group_id, user_id)
         group = await get_group(group_id, user_id)
         if group is None:
@@ -71,19 +70,19 @@ async def get_group_endpoint(group_id: str, current_user: UserClaims = Depends(v
 
 
 @router.put("/{group_id}", response_model=GroupResponse, summary="Update an existing group")
-async def update_group_endpoint(group_id: str, group: GroupUpdate, current_user: UserClaims = Depends(validate_token)):
+async def update_group_endpoint(group_id: str, group: GroupUpdate, user_id: str = Depends(get_user_id)):
     """
     Updates an existing group's details, ensuring it belongs to the authenticated user.
     Requires `group_id` in the path, update data in the request body, and a valid authentication token.
     """
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to update group_id: %s", user_id, group_id)
         group.user_id = user_id
         updated_group = await update_group(group_id, group)
         if updated_group is None:
             logger.warning("Group %s not found or update failed for user %s", group_id, user_id)
             raise HTTPException(status_code=404, detail="Group not found or update failed")
+        await invalidate_group_context_cache(user_id)
         logger.info("Successfully updated group: %s by user %s", group_id, user_id)
         return updated_group
     except HTTPException as http_exc:
@@ -94,15 +93,15 @@ async def update_group_endpoint(group_id: str, group: GroupUpdate, current_user:
 
 
 @router.delete("/{group_id}", response_model=DeleteResponse, summary="Delete a group")
-async def delete_group_endpoint(group_id: str, current_user: UserClaims = Depends(validate_token)):
+async def delete_group_endpoint(group_id: str, user_id: str = Depends(get_user_id)):
     """
     Deletes a group by its ID, ensuring it belongs to the authenticated user.
     Requires `group_id` in the path and a valid authentication token.
     """
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to delete group_id: %s", user_id, group_id)
         result = await delete_group(group_id, user_id)
+        await invalidate_group_context_cache(user_id)
         logger.info("Successfully deleted group: %s by user %s", group_id, user_id)
         return result
     except Exception as e:
@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.responses import ORJSONResponse
 from typing import List
 from logger_config import setup_logger
 from features.llm import create_llm_account, update_llm_account, delete_llm_account, get_llm_accounts, set_default_provider, LLMAccountCreate, LLMAccountUpdate
 from models import LLMAccountResponse, ListLLMAccountsResponse, DeleteResponse
-from auth import UserClaims, validate_token
+from auth import get_user_id
 
 logger = setup_logger(__name__)
 
-router = APIRouter(prefix="/llm-account", tags=["LLM Accounts"])
+router = APIRouter(prefix="/llm-account", tags=["LLM Accounts"], default_response_class=ORJSONResponse)
 
 
 @router.post("", response_model=LLMAccountResponse, status_code=201, summary="Create or update an LLM account configuration")
-async def create_llm_account_endpoint(llm: LLMAccountCreate, current_user: UserClaims = Depends(validate_token)):
+async def create_llm_account_endpoint(llm: LLMAccountCreate, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         llm.user_id = user_id
         logger.info("User '%s' attempting to create/update LLM account for provider: %s", user_id, llm.provider)
         result = await create_llm_account(llm)
@@ -25,9 +25,8 @@ async def create_llm_account_endpoint(llm: LLMAccountCreate, current_user: UserC
 
 
 @router.get("s", response_model=ListLLMAccountsResponse, summary="List all LLM account configurations for the user")
-async def list_llm_accounts_endpoint(current_user: UserClaims = Depends(validate_token)):
+async def list_llm_accounts_endpoint(user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("Fetching LLM accounts for user: %s", user_id)
         llm_config = await get_llm_accounts(user_id)
         logger.info("Successfully retrieved %d LLM accounts and default '%s' for user: %s", len(llm_config.get("providers", [])), llm_config.get("default"), user_id)
@@ -38,9 +37,8 @@ async def list_llm_accounts_endpoint(current_user: UserClaims = Depends(validate
 
 
 @router.put("/{provider}", response_model=LLMAccountResponse, summary="Update an existing LLM account configuration")
-async def update_llm_account_endpoint(provider: str, llm: LLMAccountUpdate, current_user: UserClaims = Depends(validate_token)):
+async def update_llm_account_endpoint(provider: str, llm: LLMAccountUpdate, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         llm.user_id = user_id
         logger.info("User '%s' attempting to update LLM account for provider: %s", user_id, provider)
         result = await update_llm_account(provider, llm)
@@ -57,9 +55,8 @@ async def update_llm_account_endpoint(provider: str, llm: LLMAccountUpdate, curr
 
 
 @router.delete("/{provider}", response_model=DeleteResponse, summary="Delete an LLM account configuration")
-async def delete_llm_account_endpoint(provider: str, current_user: UserClaims = Depends(validate_token)):
+async def delete_llm_account_endpoint(provider: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to delete LLM account for provider: %s", user_id, provider)
         result = await delete_llm_account(provider, user_id)
         logger.info("Successfully deleted LLM account for provider %s, user %s", provider, user_id)
@@ -70,9 +67,8 @@ async def delete_llm_account_endpoint(provider: str, current_user: UserClaims =
 
 
 @router.put("/{provider}/set-default", response_model=LLMAccountResponse, summary="Set an LLM provider as the default for the user")
-async def set_default_provider_endpoint(provider: str, current_user: UserClaims = Depends(validate_token)):
+async def set_default_provider_endpoint(provider: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to set default provider to: %s", user_id, provider)
         result = await set_default_provider(provider, user_id)
         if result is None:
@@ -1,22 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi.responses import ORJSONResponse
 from logger_config import setup_logger
 
 from features.meeting import create_meeting, get_meeting, list_meetings, delete_meeting, MeetingCreate
 
 from models import MeetingResponse, ListMeetingsResponse, DeleteResponse
 
-from auth import UserClaims, validate_token
+from auth import get_user_id
 
 logger = setup_logger(__name__)
 
-router = APIRouter(prefix="/meeting", tags=["Meetings"])
+router = APIRouter(prefix="/meeting", tags=["Meetings"], default_response_class=ORJSONResponse)
 
 
 @router.post("", response_model=MeetingResponse, status_code=201, summary="Create a new meeting")
-async def create_meeting_endpoint(meeting: MeetingCreate, current_user: UserClaims = Depends(validate_token)):
+async def create_meeting_endpoint(meeting: MeetingCreate, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         meeting.user_id = user_id
         logger.info("User '%s' attempting to create new meeting for group: %s", user_id, meeting.group_id)
 
@@ -31,7 +30,7 @@ async def create_meeting_endpoint(meeting: MeetingCreate, current_user: UserClai
             "group_id": meeting.group_id or "",
             "topic": meeting.topic,
             "status": "created",
-            "created_at": str(int(meeting._ts)) if meeting._ts else "",
+            "created_at": int(meeting._ts) if meeting._ts else None,
             "user_id": user_id,
         }
 
@@ -43,9 +42,8 @@ async def create_meeting_endpoint(meeting: MeetingCreate, current_user: UserClai
 
 
 @router.get("s", response_model=ListMeetingsResponse, summary="List all meetings for the authenticated user")
-async def list_meetings_endpoint(current_user: UserClaims = Depends(validate_token)):
+async def list_meetings_endpoint(user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("Fetching all meetings for user: %s", user_id)
         result = await list_meetings(user_id)
         logger.info("Successfully retrieved %d meetings for user: %s", len(result.get("meetings", [])), user_id)
@@ -56,9 +54,8 @@ async def list_meetings_endpoint(current_user: UserClaims = Depends(validate_tok
 
 
 @router.get("/{meeting_id}", response_model=MeetingResponse, summary="Get a specific meeting")
-async def get_meeting_endpoint(meeting_id: str, current_user: UserClaims = Depends(validate_token)):
+async def get_meeting_endpoint(meeting_id: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("Fetching meeting_id: %s for user: %s", meeting_id, user_id)
         meeting = await get_meeting(meeting_id, user_id)
         if meeting is None:
@@ -74,9 +71,8 @@ async def get_meeting_endpoint(meeting_id: str, current_user: UserClaims = Depen
 
 
 @router.delete("/{meeting_id}", response_model=DeleteResponse, summary="Delete a meeting")
-async def delete_meeting_endpoint(meeting_id: str, current_user: UserClaims = Depends(validate_token)):
+async def delete_meeting_endpoint(meeting_id: str, user_id: str = Depends(get_user_id)):
     try:
-        user_id = current_user.email
         logger.info("User '%s' attempting to delete meeting_id: %s", user_id, meeting_id)
         result = await delete_meeting(meeting_id, user_id)
         logger.info("Successfully deleted meeting: %s by user %s", meeting_id, user_id)
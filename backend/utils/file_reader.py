@@ -1,6 +1,10 @@
 import io
+import asyncio
 import logging
+import threading
+import orjson
 from pathlib import Path
+from typing import BinaryIO
 from fastapi import UploadFile, HTTPException
 
 # Configure logger
@@ -14,15 +18,114 @@ except ImportError:
     pypdf = None
     logger.warning("pypdf not installed. PDF processing will not be available.")
 
+try:
+    # Native PDFium bindings; much faster text extraction than pure-Python pypdf, which is kept as the fallback
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PDFium is not thread-safe, so concurrent uploads take turns extracting through it
+_pdfium_lock = threading.Lock()
+
 try:
     from docx import Document
 except ImportError:
     Document = None
     logger.warning("python-docx not installed. DOCX processing will not be available.")
 
-SUPPORTED_TEXT_EXTENSIONS = {".txt", ".md", ".json", ".yaml", ".yml", ".csv", ".log"}
-SUPPORTED_PDF_EXTENSIONS = {".pdf"}
-SUPPORTED_DOCX_EXTENSIONS = {".docx"}
+SUPPORTED_TEXT_EXTENSIONS = frozenset({".txt", ".md", ".json", ".yaml", ".yml", ".csv", ".log"})
+SUPPORTED_PDF_EXTENSIONS = frozenset({".pdf"})
+SUPPORTED_DOCX_EXTENSIONS = frozenset({".docx"})
+SUPPORTED_EXTENSIONS = SUPPORTED_TEXT_EXTENSIONS | SUPPORTED_PDF_EXTENSIONS | SUPPORTED_DOCX_EXTENSIONS
+# Listed in unsupported-type errors; computed once rather than on every rejected upload
+SUPPORTED_EXTENSIONS_DISPLAY = ", ".join(sorted(SUPPORTED_EXTENSIONS))
+
+# Libraries that must be installed to read a given extension, used to explain why it is unavailable
+REQUIRED_LIBRARIES = {**{ext: "'pypdfium2' or 'pypdf'" for ext in SUPPORTED_PDF_EXTENSIONS}, **{ext: "'python-docx'" for ext in SUPPORTED_DOCX_EXTENSIONS}}
+
+
+def _read_json(content_bytes: bytes, filename: str) -> str:
+    logger.debug(f"Reading '{filename}' as a JSON file.")
+    try:
+        # orjson parses the raw bytes directly; re-dumping gives compact text for chunking
+        return orjson.dumps(orjson.loads(content_bytes)).decode()
+    except orjson.JSONDecodeError:
+        logger.error(f"Failed to parse file '{filename}' as JSON.")
+        raise HTTPException(status_code=400, detail=f"Failed to parse file '{filename}' content as UTF-8 JSON.")
+
+
+def _read_text(content_bytes: bytes, filename: str) -> str:
+    logger.debug(f"Reading '{filename}' as a text file.")
+    try:
+        return content_bytes.decode("utf-8")
+    except UnicodeDecodeError:
+        logger.error(f"Failed to decode file '{filename}' as UTF-8.")
+        raise HTTPException(status_code=400, detail=f"Failed to decode file '{filename}' content as UTF-8.")
+
+
+def _read_pdf(pdf_file: BinaryIO, filename: str) -> str:
+    """Fallback PDF reader, used only when pypdfium2 is not installed."""
+    logger.debug(f"Reading '{filename}' as a PDF file.")
+    try:
+        pdf_reader = pypdf.PdfReader(pdf_file)
+        text_content = "".join([page.extract_text() or "" for page in pdf_reader.pages])  # Add null check
+        if not text_content.strip():
+            logger.warning(f"Extracted empty text from PDF: {filename}")
+        return text_content
+    except Exception as e:
+        logger.error(f"Failed to read PDF file '{filename}': {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Failed to process PDF file '{filename}'. It might be corrupted or password-protected.")
+
+
+def _read_pdf_pdfium(pdf_file: BinaryIO, filename: str) -> str:
+    logger.debug(f"Reading '{filename}' as a PDF file with PDFium.")
+    try:
+        with _pdfium_lock:
+            document = pdfium.PdfDocument(pdf_file)
+            try:
+                parts = []
+                for page in document:
+                    text_page = page.get_textpage()
+                    parts.append(text_page.get_text_range())
+                    text_page.close()
+                    page.close()
+            finally:
+                document.close()
+        text_content = "".join(parts)
+        if not text_content.strip():
+            logger.warning(f"Extracted empty text from PDF: {filename}")
+        return text_content
+    except Exception as e:
+        logger.error(f"Failed to read PDF file '{filename}': {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Failed to process PDF file '{filename}'. It might be corrupted or password-protected.")
+
+
+def _read_docx(docx_file: BinaryIO, filename: str) -> str:
+    logger.debug(f"Reading '{filename}' as a DOCX file.")
+    try:
+        document = Document(docx_file)
+        text_content = "\n".join([para.text for para in document.paragraphs])
+        if not text_content.strip():
+            logger.warning(f"Extracted empty text from DOCX: {filename}")
+        return text_content
+    except Exception as e:
+        logger.error(f"Failed to read DOCX file '{filename}': {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Failed to process DOCX file '{filename}'. It might be corrupted.")
+
+
+# Extension -> reader, built once at import. Extensions whose library is not installed are left out.
+_HANDLERS = {ext: _read_text for ext in SUPPORTED_TEXT_EXTENSIONS}
+_HANDLERS[".json"] = _read_json
+if pdfium is not None:
+    _HANDLERS.update({ext: _read_pdf_pdfium for ext in SUPPORTED_PDF_EXTENSIONS})
+elif pypdf is not None:
+    _HANDLERS.update({ext: _read_pdf for ext in SUPPORTED_PDF_EXTENSIONS})
+if Document is not None:
+    _HANDLERS.update({ext: _read_docx for ext in SUPPORTED_DOCX_EXTENSIONS})
+
+# Readers that parse whole documents and would block the event loop; these run in a worker thread
+# and are given the upload's file object instead of a copy of its bytes
+_BLOCKING_HANDLERS = {_read_pdf, _read_pdf_pdfium, _read_docx}
 
 
 async def read_file_content(file: UploadFile) -> str:
@@ -32,59 +135,33 @@ async def read_file_content(file: UploadFile) -> str:
     logger.info(f"Attempting to read content from file: {filename} (extension: {file_extension})")
 
     try:
-        # Read the file content once into memory
-        content_bytes = await file.read()
-        logger.debug(f"Read {len(content_bytes)} bytes from file: {filename}")
-        if not content_bytes:
+        handler = _HANDLERS.get(file_extension)
+        if handler is None:
+            if file_extension in REQUIRED_LIBRARIES:
+                library = REQUIRED_LIBRARIES[file_extension]
+                logger.error(f"{library} is required for {file_extension} processing but not installed.")
+                raise HTTPException(status_code=501, detail=f"{file_extension.lstrip('.').upper()} processing is not available. Please install {library}.")
+            logger.error(f"Unsupported file type: {file_extension} for file '{filename}'")
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}. Supported types: {SUPPORTED_EXTENSIONS_DISPLAY}")
+
+        if handler in _BLOCKING_HANDLERS:
+            # pypdf and python-docx read the spooled upload directly, so it is never held in memory twice
+            source = file.file
+            await file.seek(0)
+            size = source.seek(0, io.SEEK_END)
+            source.seek(0)
+        else:
+            # Read the file content once into memory
+            source = await file.read()
+            size = len(source)
+        logger.debug(f"Read {size} bytes from file: {filename}")
+        if not size:
             logger.error(f"File '{filename}' is empty or stream was exhausted.")
             raise HTTPException(status_code=400, detail=f"File '{filename}' is empty or could not be read.")
 
-        if file_extension in SUPPORTED_TEXT_EXTENSIONS:
-            logger.debug(f"Reading '{filename}' as a text file.")
-            try:
-                return content_bytes.decode("utf-8")
-            except UnicodeDecodeError:
-                logger.error(f"Failed to decode file '{filename}' as UTF-8.")
-                raise HTTPException(status_code=400, detail=f"Failed to decode file '{filename}' content as UTF-8.")
-
-        elif file_extension in SUPPORTED_PDF_EXTENSIONS:
-            if pypdf is None:
-                logger.error("pypdf library is required for PDF processing but not installed.")
-                raise HTTPException(status_code=501, detail="PDF processing is not available. Please install 'pypdf'.")
-            logger.debug(f"Reading '{filename}' as a PDF file.")
-            try:
-                # Create a BytesIO object for pypdf
-                pdf_file = io.BytesIO(content_bytes)
-                pdf_reader = pypdf.PdfReader(pdf_file)
-                text_content = ""
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() or ""  # Add null check
-                if not text_content.strip():
-                    logger.warning(f"Extracted empty text from PDF: {filename}")
-                return text_content
-            except Exception as e:
-                logger.error(f"Failed to read PDF file '{filename}': {e}", exc_info=True)
-                raise HTTPException(status_code=400, detail=f"Failed to process PDF file '{filename}'. It might be corrupted or password-protected.")
-
-        elif file_extension in SUPPORTED_DOCX_EXTENSIONS:
-            if Document is None:
-                logger.error("python-docx library is required for DOCX processing but not installed.")
-                raise HTTPException(status_code=501, detail="DOCX processing is not available. Please install 'python-docx'.")
-            logger.debug(f"Reading '{filename}' as a DOCX file.")
-            try:
-                document = Document(io.BytesIO(content_bytes))
-                text_content = "\n".join([para.text for para in document.paragraphs])
-                if not text_content.strip():
-                    logger.warning(f"Extracted empty text from DOCX: {filename}")
-                return text_content
-            except Exception as e:
-                logger.error(f"Failed to read DOCX file '{filename}': {e}", exc_info=True)
-                raise HTTPException(status_code=400, detail=f"Failed to process DOCX file '{filename}'. It might be corrupted.")
-
-        else:
-            logger.error(f"Unsupported file type: {file_extension} for file '{filename}'")
-            supported_types = SUPPORTED_TEXT_EXTENSIONS | SUPPORTED_PDF_EXTENSIONS | SUPPORTED_DOCX_EXTENSIONS
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}. Supported types: {', '.join(sorted(supported_types))}")
+        if handler in _BLOCKING_HANDLERS:
+            return await asyncio.to_thread(handler, source, filename)
+        return handler(source, filename)
 
     except Exception as e:
         # Catch any other unexpected errors during file processing
@@ -96,6 +173,6 @@ async def read_file_content(file: UploadFile) -> str:
         raise HTTPException(status_code=500, detail=f"An internal error occurred while processing file '{filename}'.")
 
 
-def get_supported_extensions() -> set:
+def get_supported_extensions() -> frozenset:
     """Returns a set of all supported file extensions."""
-    return SUPPORTED_TEXT_EXTENSIONS | SUPPORTED_PDF_EXTENSIONS | SUPPORTED_DOCX_EXTENSIONS
+    return SUPPORTED_EXTENSIONS
@@ -1,20 +1,304 @@
 import os
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from logger_config import setup_logger
-from llm_providers.azure_openai import AzureOpenAIClient
-from llm_providers.openai_client import OpenAIClient
-from llm_providers.grok_client import GrokClient  # Added GrokClient import
-from llm_providers.deepseek_client import DeepseekClient
-from llm_providers.gemini_client import GeminiClient  # Added Gemini client
+import llm_providers
+
+# Load environment variables
+load_dotenv()
 
 # Set up logger
 logger = setup_logger(__name__)
 
 
+def _make_validator(required_fields, allow_none=()):
+    """Build a validator for one provider's required fields, resolving which fields may be None up front."""
+    checks = tuple((field, field in allow_none) for field in required_fields)
+
+    def validate(provider, provider_details):
+        missing_fields = [
+            field if field not in provider_details else f"{field} (cannot be None)"
+            for field, nullable in checks
+            if field not in provider_details or (provider_details[field] is None and not nullable)
+        ]
+        if missing_fields:
+            error_msg = f"Missing or invalid required fields for {provider}: {', '.join(missing_fields)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+    return validate
+
+
+# llm_providers resolves client classes lazily, so only the selected provider's SDK is ever loaded
+def _build_azure_openai(provider_details):
+    return llm_providers.AzureOpenAIClient(
+        api_key=provider_details["api_key"],
+        azure_endpoint=provider_details["endpoint"],
+        model=provider_details.get("model", provider_details.get("deployment_name")),  # Use model or deployment_name
+    )
+
+
+def _build_openai(provider_details):
+    return llm_providers.OpenAIClient(
+        api_key=provider_details.get("api_key"),  # Pass None if not provided,
+        model=provider_details["model"],
+    )
+
+
+def _build_grok(provider_details):
+    return llm_providers.GrokClient(api_key=provider_details["api_key"], model=provider_details["model"])
+
+
+def _build_deepseek(provider_details):
+    return llm_providers.DeepseekClient(api_key=provider_details["api_key"], model=provider_details["model"])
+
+
+def _build_gemini(provider_details):
+    return llm_providers.GeminiClient(api_key=provider_details["api_key"], model=provider_details["model"])
+
+
+# Provider dispatch table, keyed by lowercased provider name: (client factory, required-field validator).
+# Adding a provider is a single entry here.
+_PROVIDERS = {
+    "azureopenai": (_build_azure_openai, _make_validator(["deployment_name", "model", "endpoint", "api_version", "api_key"])),
+    "openai": (_build_openai, _make_validator(["model", "api_key"], allow_none=("api_key",))),  # api_key can be None if env var is set
+    "grok": (_build_grok, _make_validator(["model", "api_key"])),
+    "deepseek": (_build_deepseek, _make_validator(["model", "api_key"])),
+    "gemini": (_build_gemini, _make_validator(["model", "api_key"])),
+}
+
+# Provider clients are reused across LLMClient instances with identical provider details.
+# Gemini is excluded: genai.configure sets the API key process-wide, so its clients must be rebuilt per use.
+MAX_CACHED_CLIENTS = 256
+_UNCACHED_PROVIDERS = {"gemini"}
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+
+
+def _client_cache_key(provider_details):
+    """Digest of the provider details, so cache keys never hold API keys in the clear."""
+    return hashlib.blake2b(orjson.dumps(provider_details, option=orjson.OPT_SORT_KEYS, default=str), digest_size=16).digest()
+
+
+def _get_or_build_client(provider_key, build, provider_details, cache_key):
+    """Return the cached provider client for these details, building and caching it on a miss."""
+    if provider_key in _UNCACHED_PROVIDERS:
+        return build(provider_details)
+
+    with _client_cache_lock:
+        client = _client_cache.get(cache_key)
+    if client is not None:
+        return client
+
+    client = build(provider_details)
+    with _client_cache_lock:
+        if len(_client_cache) >= MAX_CACHED_CLIENTS:
+            _client_cache.pop(next(iter(_client_cache)))
+        # Keep the first client if another thread built one concurrently
+        return _client_cache.setdefault(cache_key, client)
+
+
+class _TTLCache:
+    """Small thread-safe TTL cache that evicts the oldest entries once full."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket holding up to capacity tokens, refilled continuously at refill_rate tokens per second.
+
+    Callers reserve tokens up front, letting the balance go negative, and then wait out the deficit. This keeps
+    waiters in arrival order and spaces requests out before they reach the provider, instead of bursting into 429s.
+    """
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, cost):
+        """Take cost tokens and return how many seconds the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+            self._updated = now
+            self.tokens -= cost
+            return max(0.0, -self.tokens / self.refill_rate)
+
+    def acquire(self, cost=1):
+        wait = self._reserve(cost)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, cost=1):
+        wait = self._reserve(cost)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+# Optional per-account limits, set with rate_limit_rpm / rate_limit_tpm in the provider details.
+# Buckets are shared by every LLMClient built from the same provider details, since LLMClient is created per request.
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiters(provider_details, cache_key):
+    """Return the (requests, tokens) buckets for these provider details, either of which may be None when not limited."""
+    rpm = provider_details.get("rate_limit_rpm")
+    tpm = provider_details.get("rate_limit_tpm")
+    if not rpm and not tpm:
+        return None, None
+
+    with _rate_limiters_lock:
+        limiters = _rate_limiters.get(cache_key)
+        if limiters is None:
+            if len(_rate_limiters) >= MAX_CACHED_CLIENTS:
+                _rate_limiters.pop(next(iter(_rate_limiters)))
+            limiters = (
+                _TokenBucket(rpm, rpm / 60) if rpm else None,
+                _TokenBucket(tpm, tpm / 60) if tpm else None,
+            )
+            _rate_limiters[cache_key] = limiters
+        return limiters
+
+
+def _estimate_tokens(prompt_or_messages, kwargs):
+    """Rough token cost of a request: the prompt at ~4 characters per token, plus max_tokens when the caller sets it."""
+    prompt = prompt_or_messages if isinstance(prompt_or_messages, str) else orjson.dumps(prompt_or_messages, default=str)
+    return len(prompt) // 4 + kwargs.get("max_tokens", 0)
+
+
+# Completions are only cached when the caller asks for it (cache=True) or sampling is deterministic (temperature=0).
+# Embeddings are deterministic for a given model, so they are always cached.
+RESPONSE_CACHE_TTL = 600  # seconds
+EMBEDDING_CACHE_TTL = 3600  # seconds
+_response_cache = _TTLCache(maxsize=1024, ttl=RESPONSE_CACHE_TTL)
+_embedding_cache = _TTLCache(maxsize=512, ttl=EMBEDDING_CACHE_TTL)
+
+
+def _request_cache_key(scope, *parts):
+    """Digest of a request, scoped to the provider details so cached results are never shared across accounts."""
+    return hashlib.blake2b(scope + orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str), digest_size=16).digest()
+
+
+def _should_cache(kwargs):
+    """Pop the cache flag from the request kwargs, defaulting to caching only deterministic requests."""
+    cache = kwargs.pop("cache", None)
+    return kwargs.get("temperature") == 0 if cache is None else cache
+
+
+class _SemanticCache:
+    """
+    Thread-safe cache of recent responses keyed by prompt embedding, returning a stored response for any
+    prompt whose embedding is close enough to a cached one. Entries are grouped by scope, so only requests
+    to the same account with the same parameters can match, and each scope keeps its newest maxsize entries.
+
+    A scope's vectors are kept as one float32 matrix and scored with a single matrix-vector product.
+    """
+
+    def __init__(self, maxsize, ttl, threshold):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._scopes = {}  # scope -> {"entries": [(expires_at, vector, response)], "matrix": stacked vectors or None}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def get(self, scope, embedding, threshold=None):
+        """Return the cached response most similar to embedding, or None if none reaches the threshold (the cache's own unless given)."""
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            state = self._scopes.get(scope)
+            if not state:
+                return None
+            now = time.monotonic()
+            entries = state["entries"]
+            if entries and entries[0][0] < now:
+                entries[:] = [entry for entry in entries if entry[0] >= now]
+                state["matrix"] = None
+            if not entries:
+                return None
+            if state["matrix"] is None:
+                state["matrix"] = np.stack([vector for _, vector, _ in entries])
+            matrix, candidates = state["matrix"], list(entries)
+
+        scores = matrix @ self._normalize(embedding)
+        best = int(scores.argmax())
+        return candidates[best][2] if scores[best] >= threshold else None
+
+    def set(self, scope, embedding, response):
+        entry = (time.monotonic() + self.ttl, self._normalize(embedding), response)
+        with self._lock:
+            state = self._scopes.setdefault(scope, {"entries": [], "matrix": None})
+            state["entries"].append(entry)
+            del state["entries"][: -self.maxsize]
+            state["matrix"] = None
+
+
+# Opt-in per call with semantic_cache, for prompts where a near-duplicate's answer is acceptable.
+# Costs one (cached) embedding request per prompt, so only worth it where completions are slow or expensive.
+SEMANTIC_CACHE_TTL = 600  # seconds
+SEMANTIC_CACHE_THRESHOLD = 0.95  # cosine similarity
+_semantic_cache = _SemanticCache(maxsize=128, ttl=SEMANTIC_CACHE_TTL, threshold=SEMANTIC_CACHE_THRESHOLD)
+
+
+def _prompt_text(prompt_or_messages):
+    """The text of a prompt or message list, as embedded for the semantic cache."""
+    if isinstance(prompt_or_messages, str):
+        return prompt_or_messages
+    return "\n".join(msg["content"] for msg in prompt_or_messages if msg.get("content"))
+
+
+def _semantic_parts(prompt_or_messages, semantic_cache, semantic_context):
+    """
+    Split a prompt into the text compared by similarity and the context that must match exactly.
+
+    semantic_cache=True compares the whole prompt. Passing a string compares only that string, e.g. the
+    user's topic, so a long shared template can't make unrelated requests look similar. semantic_context is
+    then what the prompt was built from apart from that string, e.g. the group context, and must be identical;
+    without it the whole prompt must match.
+    """
+    if isinstance(semantic_cache, str):
+        return semantic_cache, prompt_or_messages if semantic_context is None else semantic_context
+    return _prompt_text(prompt_or_messages), None
+
+
 class LLMClient:
     def __init__(self, provider_details):
-        load_dotenv()  # Ensure environment variables are loaded
-
         if not isinstance(provider_details, dict):
             error_msg = "Provider details must be a dictionary"
             logger.error(error_msg)
@@ -29,90 +313,179 @@ class LLMClient:
         logger.info("Initializing LLM client with provider: %s", self.provider)
 
         try:
-            if self.provider.lower() == "azureopenai":
-                required_fields = ["deployment_name", "model", "endpoint", "api_version", "api_key"]
-                self._validate_required_fields(provider_details, required_fields)
-
-                self.client = AzureOpenAIClient(
-                    api_key=provider_details["api_key"],
-                    azure_endpoint=provider_details["endpoint"],
-                    model=provider_details.get("model", provider_details.get("deployment_name")),  # Use model or deployment_name
-                )
-            elif self.provider.lower() == "openai":
-                required_fields = ["model", "api_key"]  # api_key can be None if env var is set
-                self._validate_required_fields(provider_details, required_fields, allow_none=["api_key"])
-
-                self.client = OpenAIClient(
-                    api_key=provider_details.get("api_key"),  # Pass None if not provided,
-                    model=provider_details["model"],
-                )
-            elif self.provider.lower() == "grok":  # Added Grok provider handling
-                required_fields = ["model", "api_key"]
-                self._validate_required_fields(provider_details, required_fields)
-
-                self.client = GrokClient(
-                    api_key=provider_details["api_key"],
-                    model=provider_details["model"],
-                )
-            elif self.provider.lower() == "deepseek":
-                required_fields = ["model", "api_key"]
-                self._validate_required_fields(provider_details, required_fields)
-
-                self.client = DeepseekClient(
-                    api_key=provider_details["api_key"],
-                    model=provider_details["model"],
-                )
-            elif self.provider.lower() == "gemini":
-                required_fields = ["model", "api_key"]
-                self._validate_required_fields(provider_details, required_fields)
-
-                self.client = GeminiClient(
-                    api_key=provider_details["api_key"],
-                    model=provider_details["model"],
-                )
-            else:
+            provider_key = self.provider.lower()
+            entry = _PROVIDERS.get(provider_key)
+            if entry is None:
                 error_msg = f"Unsupported provider: {self.provider}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
+            build, validate = entry
+            validate(self.provider, provider_details)
+
+            self._cache_scope = _client_cache_key(provider_details)
+            self.client = _get_or_build_client(provider_key, build, provider_details, self._cache_scope)
+            self._req_bucket, self._tok_bucket = _get_rate_limiters(provider_details, self._cache_scope)
         except Exception as e:
             logger.error("Failed to initialize LLM client: %s", str(e), exc_info=True)
             raise
 
-    def _validate_required_fields(self, provider_details, required_fields, allow_none=None):
-        """Validate that all required fields are present in provider_details."""
-        if allow_none is None:
-            allow_none = []
+    def _acquire(self, prompt_or_messages, kwargs):
+        """Block until the account's rate limits allow another request. A no-op for unlimited accounts."""
+        if self._req_bucket:
+            self._req_bucket.acquire()
+        if self._tok_bucket:
+            self._tok_bucket.acquire(_estimate_tokens(prompt_or_messages, kwargs))
+
+    async def _acquire_async(self, prompt_or_messages, kwargs):
+        """Async _acquire, waiting without blocking the event loop."""
+        if self._req_bucket:
+            await self._req_bucket.acquire_async()
+        if self._tok_bucket:
+            await self._tok_bucket.acquire_async(_estimate_tokens(prompt_or_messages, kwargs))
+
+    def _send_request(self, prompt_or_messages, **kwargs):
+        self._acquire(prompt_or_messages, kwargs)
+        return self.client.send_request(prompt_or_messages, **kwargs)
 
-        missing_fields = []
-        for field in required_fields:
-            if field not in provider_details:
-                missing_fields.append(field)
-            elif provider_details[field] is None and field not in allow_none:
-                missing_fields.append(f"{field} (cannot be None)")
+    async def _asend_request(self, prompt_or_messages, **kwargs):
+        await self._acquire_async(prompt_or_messages, kwargs)
+        return await self.client.asend_request(prompt_or_messages, **kwargs)
 
-        if missing_fields:
-            error_msg = f"Missing or invalid required fields for {self.provider}: {', '.join(missing_fields)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+    def _semantic_embedding(self, text):
+        """Embedding of a prompt for the semantic cache, or None if the provider cannot embed it."""
+        try:
+            return self.generate_embeddings(text)
+        except Exception as e:
+            logger.debug("Skipping semantic cache, prompt embedding failed: %s", str(e))
+            return None
+
+    def _semantic_send_request(self, prompt_or_messages, semantic_cache, semantic_context=None, cache_if=None, threshold=None, **kwargs):
+        text, context = _semantic_parts(prompt_or_messages, semantic_cache, semantic_context)
+        scope = _request_cache_key(self._cache_scope, "semantic", context, kwargs)
+        embedding = self._semantic_embedding(text)
+        if embedding is None:
+            return self._send_request(prompt_or_messages, **kwargs)
+
+        response = _semantic_cache.get(scope, embedding, threshold)
+        if response is None:
+            response = self._send_request(prompt_or_messages, **kwargs)
+            if cache_if is None or cache_if(response):
+                _semantic_cache.set(scope, embedding, response)
+        else:
+            logger.debug("Semantic cache hit for %s request", self.provider)
+        return response
+
+    async def _semantic_asend_request(self, prompt_or_messages, semantic_cache, semantic_context=None, cache_if=None, threshold=None, **kwargs):
+        text, context = _semantic_parts(prompt_or_messages, semantic_cache, semantic_context)
+        scope = _request_cache_key(self._cache_scope, "semantic", context, kwargs)
+        embedding = await asyncio.to_thread(self._semantic_embedding, text)
+        if embedding is None:
+            return await self._asend_request(prompt_or_messages, **kwargs)
+
+        response = _semantic_cache.get(scope, embedding, threshold)
+        if response is None:
+            response = await self._asend_request(prompt_or_messages, **kwargs)
+            if cache_if is None or cache_if(response):
+                _semantic_cache.set(scope, embedding, response)
+        else:
+            logger.debug("Semantic cache hit for %s request", self.provider)
+        return response
+
+    @staticmethod
+    def _sender(send, semantic_send, kwargs):
+        """Pop the caching options from the request kwargs and pick the send function they call for."""
+        cache_if = kwargs.pop("cache_if", None)
+        semantic_cache = kwargs.pop("semantic_cache", False)
+        semantic_context = kwargs.pop("semantic_context", None)
+        threshold = kwargs.pop("semantic_threshold", None)
+        if semantic_cache:
+            send = functools.partial(semantic_send, semantic_cache=semantic_cache, semantic_context=semantic_context, cache_if=cache_if, threshold=threshold)
+        return send, cache_if
 
     def send_request(self, prompt_or_messages, **kwargs):
-        """Sends a request using the initialized provider client."""
-        return self.client.send_request(prompt_or_messages, **kwargs)
+        """
+        Sends a request using the initialized provider client. Pass cache=True to reuse an identical recent response,
+        or semantic_cache=True to also reuse the response to a recent, closely similar prompt. semantic_cache can also
+        be the part of the prompt to compare by similarity, with semantic_context (the rest of what the prompt was
+        built from) matched exactly, and semantic_threshold overrides the similarity a cached prompt needs to match.
+
+        cache_if is an optional predicate on the response; responses it rejects are returned but not cached.
+        """
+        send, cache_if = self._sender(self._send_request, self._semantic_send_request, kwargs)
+        if not _should_cache(kwargs):
+            return send(prompt_or_messages, **kwargs)
+
+        cache_key = _request_cache_key(self._cache_scope, "send_request", prompt_or_messages, kwargs)
+        response = _response_cache.get(cache_key)
+        if response is None:
+            response = send(prompt_or_messages, **kwargs)
+            if cache_if is None or cache_if(response):
+                _response_cache.set(cache_key, response)
+        return response
+
+    async def asend_request(self, prompt_or_messages, **kwargs):
+        """Async send_request, sharing its response caches. Awaits the provider's async SDK client where it has one."""
+        send, cache_if = self._sender(self._asend_request, self._semantic_asend_request, kwargs)
+        if not _should_cache(kwargs):
+            return await send(prompt_or_messages, **kwargs)
+
+        cache_key = _request_cache_key(self._cache_scope, "send_request", prompt_or_messages, kwargs)
+        response = _response_cache.get(cache_key)
+        if response is None:
+            response = await send(prompt_or_messages, **kwargs)
+            if cache_if is None or cache_if(response):
+                _response_cache.set(cache_key, response)
+        return response
+
+    async def astream_request(self, prompt_or_messages, **kwargs):
+        """Async generator yielding the response text as the provider streams it. Streamed responses are never cached."""
+        for option in ("cache", "cache_if", "semantic_cache", "semantic_context", "semantic_threshold"):
+            kwargs.pop(option, None)
+        await self._acquire_async(prompt_or_messages, kwargs)
+        async for chunk in self.client.astream_request(prompt_or_messages, **kwargs):
+            yield chunk
+
+    def _send_structured_request(self, prompt_or_messages, response_format, **kwargs):
+        self._acquire(prompt_or_messages, kwargs)
+        return self.client.send_request_w_structured_response(prompt_or_messages, response_format, **kwargs)
 
     def send_request_w_structured_response(self, prompt_or_messages, response_format, **kwargs):
         """Sends a request expecting a structured response using the initialized provider client."""
-        return self.client.send_request_w_structured_response(prompt_or_messages, response_format, **kwargs)
+        if not _should_cache(kwargs):
+            return self._send_structured_request(prompt_or_messages, response_format, **kwargs)
+
+        format_name = f"{response_format.__module__}.{response_format.__qualname__}"
+        cache_key = _request_cache_key(self._cache_scope, "structured", prompt_or_messages, format_name, kwargs)
+        response = _response_cache.get(cache_key)
+        if response is None:
+            response = self._send_structured_request(prompt_or_messages, response_format, **kwargs)
+            _response_cache.set(cache_key, response)
+        return response
 
     def generate_embeddings(self, text: str) -> list[float]:
-        """Sends a request expecting a structured response using the initialized provider client."""
-        return self.client.generate_embeddings(text)
+        """Generates embeddings for a text, reusing a cached vector for text embedded recently."""
+        cache_key = _request_cache_key(self._cache_scope, "embeddings", text)
+        embeddings = _embedding_cache.get(cache_key)
+        if embeddings is None:
+            embeddings = self.client.generate_embeddings(text)
+            _embedding_cache.set(cache_key, embeddings)
+        return embeddings
+
+    def generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """Generates embeddings for several texts in as few provider round trips as the provider allows, skipping cached texts."""
+        cache_keys = [_request_cache_key(self._cache_scope, "embeddings", text) for text in texts]
+        results = [_embedding_cache.get(cache_key) for cache_key in cache_keys]
+        missing = [i for i, embeddings in enumerate(results) if embeddings is None]
+        if missing:
+            for i, embeddings in zip(missing, self.client.generate_embeddings_batch([texts[i] for i in missing])):
+                _embedding_cache.set(cache_keys[i], embeddings)
+                results[i] = embeddings
+        return results
 
 
 # Example usage (similar to the original __main__ block)
 if __name__ == "__main__":
     try:
-        load_dotenv()
-
         # Example Azure OpenAI provider details
         azure_provider_details = {
             "provider": "AzureOpenAI",